@@ -1,7 +1,12 @@
+import logging
 import pandas as pd
 from src.core.orchestrator import Orchestrator
 
 if __name__ == "__main__":
+    # Show AutoDS's own progress messages without the HTTP client's request logs
+    logging.basicConfig(format="%(message)s")
+    logging.getLogger("src").setLevel(logging.INFO)
+    
     # Instantiate the Orchestrator
     orchestrator = Orchestrator()
     
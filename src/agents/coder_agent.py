@@ -1,9 +1,4 @@
-import os
-import openai
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
+from .llm_client import MODEL, complete_chat
 
 def generate_code(task_description: str) -> str:
     """
@@ -15,14 +10,6 @@ def generate_code(task_description: str) -> str:
     Returns:
         str: Generated Python code for the transform_data function
     """
-    # Load API key from environment variables
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise ValueError("OpenAI API key not found in environment variables")
-    
-    # Set up the OpenAI client
-    client = openai.OpenAI(api_key=api_key)
-    
     # Construct the system prompt
     system_prompt = """
     You are an expert Python developer specializing in data science and pandas DataFrame operations.
@@ -50,18 +37,18 @@ def generate_code(task_description: str) -> str:
     
     # Make the API call
     try:
-        response = client.chat.completions.create(
-            model="gpt-4",  # Using GPT-4 for better code generation
+        response_content = complete_chat(
+            model=MODEL,  # Configurable through AUTODS_MODEL
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": task_description}
             ],
-            temperature=0.2,  # Lower temperature for more deterministic outputs
-            max_tokens=1000
+            temperature=0,  # Deterministic outputs, so cached responses are reproducible
+            max_tokens=512  # A single transform_data function fits comfortably
         )
         
         # Extract the code from the response
-        code_content = response.choices[0].message.content.strip()
+        code_content = response_content.strip()
         
         # Remove any potential markdown code block syntax
         if code_content.startswith("```python"):
@@ -1,7 +1,32 @@
-import os
 import json
-import openai
 from typing import List, Dict, Any
+from .llm_client import MODEL, complete_chat
+
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+def _format_profile(data_profile: Dict[str, Any]) -> str:
+    """
+    Serialize a data profile as indented JSON for the planner prompt.
+    
+    Uses orjson when it is installed, which also handles NumPy scalars from
+    describe() without converting them first.
+    
+    Args:
+        data_profile (Dict[str, Any]): The data profile to serialize
+        
+    Returns:
+        str: The indented JSON text
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            data_profile,
+            default=str,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        ).decode()
+    return json.dumps(data_profile, indent=2, default=str)
 
 def generate_plan(data_profile: dict, user_context: str) -> list:
     """
@@ -13,12 +38,8 @@ def generate_plan(data_profile: dict, user_context: str) -> list:
         
     Returns:
         A list of dictionaries, each representing a step in the data processing plan
+        along with the code that implements it
     """
-    # Load OpenAI API key from environment variable
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise ValueError("OpenAI API key not found. Please set the OPENAI_API_KEY environment variable.")
-    
     # Construct the system prompt
     system_prompt = """
     You are a world-class senior data scientist with expertise in data preparation, cleaning, and analysis.
@@ -31,44 +52,70 @@ def generate_plan(data_profile: dict, user_context: str) -> list:
     For example, instead of just saying "Clean missing values", specify which columns have missing values,
     what method to use for imputation (mean, median, mode, etc.), and why that method is appropriate for that column.
     
-    Your response MUST be a valid JSON list of dictionaries. Each dictionary represents one task in the plan and must have these keys:
+    For every step you must also write the Python code that implements it. The code MUST:
+    1. Define a function named 'transform_data'
+    2. Accept ONE argument: a pandas DataFrame named 'df'
+    3. Return the modified DataFrame
+    4. Handle potential errors gracefully (e.g., missing columns)
+    5. Not include any print statements or visualizations
+    The names 'pd' (pandas) and 'np' (numpy) are available to the code; import any other module inside the function.
+    
+    Also list the columns each step reads and writes. Steps that touch different columns may be
+    executed in parallel on just those columns, so these lists must be complete.
+    
+    Your response MUST be a valid JSON object with a single key "plan" holding a list of dictionaries.
+    Each dictionary represents one task in the plan and must have these keys:
     - "id": An integer representing the step number (starting from 1)
     - "task": A clear, descriptive string explaining the action to be taken and the rationale
+    - "code": A string with the complete Python code of the transform_data function for this step
+    - "reads": A list of the column names the code reads
+    - "writes": A list of the column names the code creates, modifies or drops.
+      Use ["*"] if the step adds or removes rows or otherwise affects every column.
     
     Example output format:
-    [
-        {"id": 1, "task": "Drop the 'customer_id' column as it is just an identifier and not useful for modeling."},
-        {"id": 2, "task": "Impute missing values in the 'income' column using the median, as the distribution is likely skewed by high earners."}
-    ]
+    {
+        "plan": [
+            {"id": 1, "task": "Drop the 'customer_id' column as it is just an identifier and not useful for modeling.", "code": "def transform_data(df):\\n    return df.drop(columns=['customer_id'], errors='ignore')", "reads": [], "writes": ["customer_id"]},
+            {"id": 2, "task": "Impute missing values in the 'income' column using the median, as the distribution is likely skewed by high earners.", "code": "def transform_data(df):\\n    if 'income' in df.columns:\\n        df['income'] = df['income'].fillna(df['income'].median())\\n    return df", "reads": ["income"], "writes": ["income"]}
+        ]
+    }
     
     Be comprehensive but focused. Prioritize actions that will have the most impact on the quality of the final dataset.
     """
     
     # Prepare the user message with the data profile and context
-    user_message = f"""Data Profile:\n{json.dumps(data_profile, indent=2)}\n\nUser Context:\n{user_context}"""
+    user_message = f"""Data Profile:\n{_format_profile(data_profile)}\n\nUser Context:\n{user_context}"""
     
     try:
         # Make the API call to OpenAI
-        response = openai.ChatCompletion.create(
-            model="gpt-4",  # Using GPT-4 for better reasoning capabilities
+        response_content = complete_chat(
+            model=MODEL,  # Configurable through AUTODS_MODEL
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_message}
             ],
-            temperature=0.2,  # Lower temperature for more focused and deterministic outputs
-            max_tokens=2000  # Adjust as needed based on expected plan complexity
+            response_format={"type": "json_object"},  # Enforce a parseable JSON response
+            temperature=0,  # Deterministic outputs, so cached responses are reproducible
+            max_tokens=4000  # The plan now carries the code for every step
         )
         
         # Extract the content from the response
-        plan_json_string = response.choices[0].message.content.strip()
+        plan_json_string = response_content.strip()
         
-        # Parse the JSON string into a Python list
+        # Parse the JSON string and unwrap the plan list
         plan = json.loads(plan_json_string)
+        if isinstance(plan, dict):
+            plan = plan.get("plan", [])
         
         # Validate the structure of the plan
         for step in plan:
             if "id" not in step or "task" not in step:
                 raise ValueError(f"Invalid step format in plan: {step}")
+            if "code" in step and not isinstance(step["code"], str):
+                raise ValueError(f"Invalid code in plan step: {step}")
+            for key in ("reads", "writes"):
+                if key in step and not isinstance(step[key], list):
+                    raise ValueError(f"Invalid '{key}' in plan step: {step}")
         
         return plan
     
@@ -0,0 +1,111 @@
+import os
+import json
+import hashlib
+import functools
+import threading
+import httpx
+import openai
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+# Model used by all agents; set AUTODS_MODEL to use a different one (e.g. "gpt-4")
+MODEL = os.getenv("AUTODS_MODEL", "gpt-4o-mini")
+
+# Directory holding cached LLM responses, and how many of them to keep
+CACHE_DIR = Path(__file__).resolve().parents[2] / ".autods_llm_cache"
+CACHE_SIZE = 1000
+
+@functools.lru_cache(maxsize=1)
+def get_client() -> openai.OpenAI:
+    """
+    Return the OpenAI client shared by all agents.
+
+    The client is created once, so every agent call reuses the same HTTP
+    connection pool instead of doing a new DNS lookup and TLS handshake.
+
+    Returns:
+        openai.OpenAI: The shared client
+    """
+    # Load API key from environment variables
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("OpenAI API key not found in environment variables")
+    
+    # Keep connections to the API alive between calls
+    http_client = httpx.Client(
+        limits=httpx.Limits(max_connections=8, max_keepalive_connections=8),
+        timeout=httpx.Timeout(600.0, connect=10.0)
+    )
+    
+    return openai.OpenAI(api_key=api_key, http_client=http_client)
+
+def complete_chat(**request) -> str:
+    """
+    Run a chat completion and return the content of its first choice.
+
+    The response is streamed and its chunks joined as they arrive. Responses
+    are cached on disk, keyed by a hash of the full request (model, messages
+    and sampling parameters), so repeating a request returns the stored
+    response without calling the API. Only responses that finished normally
+    are cached. Set AUTODS_LLM_CACHE=0 to disable the cache.
+
+    Args:
+        **request: Keyword arguments for client.chat.completions.create
+
+    Returns:
+        str: The content of the response message
+    """
+    use_cache = os.getenv("AUTODS_LLM_CACHE", "1") != "0"
+    key = hashlib.sha256(json.dumps(request, sort_keys=True).encode()).hexdigest()
+    cache_path = CACHE_DIR / f"{key}.json"
+    
+    if use_cache:
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                content = json.load(f)["content"]
+            # Mark the entry as recently used
+            os.utime(cache_path)
+            return content
+        except (OSError, ValueError, KeyError):
+            pass
+    
+    stream = get_client().chat.completions.create(**request, stream=True)
+    parts = []
+    finish_reason = None
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        choice = chunk.choices[0]
+        parts.append(choice.delta.content or "")
+        finish_reason = choice.finish_reason or finish_reason
+    content = "".join(parts)
+    
+    # Only complete responses are cached; truncated or filtered ones are retried next time
+    if use_cache and content and finish_reason == "stop":
+        _store_response(cache_path, content)
+    
+    return content
+
+def _store_response(cache_path: Path, content: str):
+    """
+    Write a response to the cache, evicting the least recently used entries.
+
+    Args:
+        cache_path (Path): File to store the response in
+        content (str): The response content
+    """
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        temp_path = cache_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({"content": content}, f)
+        os.replace(temp_path, cache_path)
+        
+        cached_files = sorted(CACHE_DIR.glob("*.json"), key=lambda path: path.stat().st_mtime)
+        for path in cached_files[:-CACHE_SIZE]:
+            path.unlink(missing_ok=True)
+    except OSError as e:
+        print(f"Error caching LLM response: {e}")
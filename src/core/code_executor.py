@@ -1,21 +1,166 @@
 import os
+import ast
+import builtins
+import hashlib
+import pickle
 import subprocess
+import sys
+import threading
+import numpy as np
 import pandas as pd
+from collections import OrderedDict
 from pathlib import Path
 
+from .executor_worker import compile_code, fingerprint_dataframe, read_message, write_message
+
+# Script run by the long-lived worker process
+WORKER_SCRIPT = Path(__file__).resolve().parent / "executor_worker.py"
+
+# Builtins available to generated code that runs in-process
+SAFE_BUILTINS = frozenset({
+    "abs", "all", "any", "bool", "dict", "divmod", "enumerate", "filter", "float",
+    "frozenset", "int", "isinstance", "len", "list", "map", "max", "min", "object",
+    "pow", "range", "repr", "reversed", "round", "set", "slice", "sorted", "str",
+    "sum", "tuple", "zip",
+    "Exception", "AttributeError", "IndexError", "KeyError", "TypeError", "ValueError",
+})
+
+# Modules generated code may import when it runs in-process
+SAFE_IMPORTS = frozenset({"pandas", "numpy"})
+
+# pandas functions and constants in-process code may use as pd.<name>
+SAFE_PANDAS_FUNCTIONS = frozenset({
+    "concat", "merge", "merge_asof", "to_numeric", "to_datetime", "to_timedelta",
+    "isna", "isnull", "notna", "notnull", "cut", "qcut", "get_dummies", "crosstab",
+    "pivot_table", "pivot", "melt", "unique", "factorize", "date_range",
+    "period_range", "timedelta_range", "interval_range", "NA", "NaT",
+})
+
+# pandas classes in-process code may use as pd.<name>, only to call them or in
+# isinstance checks, so the code never holds a reference to a class it could patch
+SAFE_PANDAS_CLASSES = frozenset({
+    "DataFrame", "Series", "Index", "MultiIndex", "Categorical", "CategoricalDtype",
+    "Timestamp", "Timedelta", "Period", "Interval", "DateOffset", "NamedAgg", "Grouper",
+    "Int64Dtype", "Float64Dtype", "StringDtype", "BooleanDtype",
+})
+
+# numpy functions, scalar types and constants in-process code may use as np.<name>
+SAFE_NUMPY_NAMES = frozenset({
+    "nan", "inf", "pi", "e", "newaxis",
+    "bool_", "int8", "int16", "int32", "int64", "uint8", "uint16", "uint32", "uint64",
+    "float16", "float32", "float64", "object_", "str_", "datetime64", "timedelta64",
+    "number", "integer", "floating", "dtype",
+    "abs", "absolute", "sqrt", "cbrt", "square", "power", "exp", "expm1", "log", "log1p",
+    "log2", "log10", "sign", "floor", "ceil", "round", "rint", "trunc", "clip", "where",
+    "select", "isnan", "isinf", "isfinite", "nan_to_num", "isin", "minimum", "maximum",
+    "mean", "median", "std", "var", "sum", "prod", "min", "max", "percentile", "quantile",
+    "nanmean", "nanmedian", "nanstd", "nanvar", "nansum", "nanmin", "nanmax",
+    "nanpercentile", "nanquantile", "cumsum", "cumprod", "diff", "argmin", "argmax",
+    "sort", "argsort", "unique", "arange", "linspace", "array", "asarray", "zeros",
+    "ones", "full", "zeros_like", "ones_like", "full_like", "concatenate", "stack",
+    "logical_and", "logical_or", "logical_not", "all", "any", "digitize", "histogram",
+})
+
+# Attributes of the code's own objects that do I/O, evaluate strings, or reach
+# classes and process-wide state
+UNSAFE_ATTRIBUTES = frozenset({
+    "eval", "query", "plot", "hist", "boxplot", "style", "load", "save", "tofile",
+    "dump", "dumps", "ctypes", "construct_array_type", "memmap", "set_option",
+    "system", "popen",
+})
+
+# Methods that look up functions by name when given a string (e.g. df.agg('sum')),
+# and keywords of any call that do the same
+STRING_DISPATCH_METHODS = frozenset({
+    "agg", "aggregate", "apply", "transform", "pipe", "map", "applymap",
+})
+STRING_DISPATCH_KEYWORDS = frozenset({"func", "arg", "aggfunc"})
+
+# Attributes the code may assign to on its own objects (e.g. df.columns = [...])
+ASSIGNABLE_ATTRIBUTES = frozenset({"columns", "index", "name", "names"})
+
+# "to_*" methods that only convert data in memory
+SAFE_TO_METHODS = frozenset({
+    "to_numeric", "to_datetime", "to_timedelta", "to_list", "to_numpy", "to_dict",
+    "to_frame", "to_period", "to_timestamp", "to_flat_index",
+})
+
+class _Worker:
+    """
+    Handle on a long-lived worker process that executes generated code.
+    Requests and responses are exchanged as length-prefixed pickles over the
+    process's stdin and stdout.
+    """
+    
+    def __init__(self, cwd: Path):
+        """
+        Start the worker process.
+
+        Args:
+            cwd (Path): Working directory for the worker process
+        """
+        self.process = subprocess.Popen(
+            [sys.executable, "-u", str(WORKER_SCRIPT)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            cwd=cwd
+        )
+        
+        # Fingerprint of the DataFrame the worker holds, if any
+        self.frame_key = None
+    
+    def is_alive(self) -> bool:
+        """
+        Check whether the worker process is still running.
+        """
+        return self.process.poll() is None
+    
+    def request(self, message: dict):
+        """
+        Send a request to the worker and wait for its response.
+
+        Args:
+            message (dict): The request to send
+
+        Returns:
+            dict: The worker's response, or None if the worker exited
+        """
+        try:
+            write_message(self.process.stdin, message)
+        except (BrokenPipeError, OSError):
+            return None
+        return read_message(self.process.stdout)
+    
+    def close(self):
+        """
+        Stop the worker by closing its stdin, killing it if it does not exit.
+        """
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=5)
+        except Exception:
+            self.process.kill()
+            self.process.wait()
+
 class CodeExecutor:
     """
-    A class for safely executing generated Python code in an isolated environment.
-    The code is executed in a separate process to prevent any potential issues
-    from affecting the main application.
+    A class for safely executing generated Python code.
+    Code that passes a conservative allow-list check (_is_safe) runs directly in
+    this process; everything else is executed in a separate worker process to
+    prevent any potential issues from affecting the main application.
     """
     
-    def __init__(self, temp_dir: str = "temp_execution"):
+    def __init__(self, temp_dir: str = "temp_execution", cache_size: int = 1000,
+                 max_workers: int = None, prewarm_workers: int = 1):
         """
         Initialize the CodeExecutor with a temporary directory for execution.
-        
+
         Args:
-            temp_dir (str): Name of the temporary directory to use for code execution
+            temp_dir (str): Name of the temporary directory used as the worker's working directory
+            cache_size (int): Maximum number of results kept in the on-disk result cache
+            max_workers (int): Maximum number of concurrent worker processes (defaults to the CPU count)
+            prewarm_workers (int): Number of workers to start right away, so their interpreter
+                                   and pandas import overlap with whatever runs before the first task
         """
         # Get the project root directory
         project_root = Path(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
@@ -26,82 +171,118 @@ class CodeExecutor:
         # Create the directory if it doesn't exist
         self.temp_dir.mkdir(exist_ok=True)
         
-        # Define file paths for temporary files
-        self.input_csv_path = self.temp_dir / "input.csv"
-        self.output_csv_path = self.temp_dir / "output.csv"
-        self.script_path = self.temp_dir / "_temp_script.py"
+        # Worker processes are reused across calls. Concurrent calls each check
+        # out their own worker, up to max_workers at a time.
+        self._idle_workers = [_Worker(self.temp_dir) for _ in range(prewarm_workers)]
+        self._worker_slots = threading.BoundedSemaphore(max_workers or os.cpu_count() or 1)
+        self._lock = threading.Lock()
+        
+        # Results are cached on disk by (code, input DataFrame), least recently used first
+        self.cache_size = cache_size
+        self._cache_dir = self.temp_dir / "cache"
+        self._cache_dir.mkdir(exist_ok=True)
+        cached_files = sorted(self._cache_dir.glob("*.pkl"), key=lambda path: path.stat().st_mtime)
+        self._cache_index = OrderedDict((path.stem, path) for path in cached_files)
         
         print(f"CodeExecutor initialized with temporary directory: {self.temp_dir}")
     
-    def execute_code(self, code_string: str, input_df: pd.DataFrame) -> dict:
+    def execute_code(self, code_string: str, input_df: pd.DataFrame, frame_key: str = None) -> dict:
         """
         Execute the provided code with the input DataFrame and return the results.
+
+        The DataFrame and code are sent to a persistent worker process, which
+        applies transform_data and sends the resulting DataFrame back. If the
+        worker dies (e.g. the generated code crashed the interpreter), a new one
+        is started on the next call. Successful results are cached on disk, so
+        running the same code on the same data again skips execution entirely.
+        
+        Code that passes the _is_safe check runs directly in this process instead.
+        Errors raised by its transform_data are reported from there; the code is
+        only sent to a worker if it failed before transform_data was called, so
+        transform_data never runs twice for one call.
         
+        This method is thread-safe; concurrent calls run in separate workers.
+
         Args:
             code_string (str): The Python code string containing the transform_data function
             input_df (pd.DataFrame): The input DataFrame to process
-            
+            frame_key (str): Fingerprint of input_df (see fingerprint_dataframe), so retries
+                             on the same unmodified DataFrame don't hash it again; computed
+                             here when not given
+
         Returns:
             dict: A dictionary containing either:
                 - {'status': 'success', 'dataframe': resulting_dataframe} if successful
                 - {'status': 'error', 'traceback': error_message} if an error occurs
         """
         try:
-            # Save the input DataFrame to CSV
-            input_df.to_csv(self.input_csv_path, index=False)
-            
-            # Construct the full script
-            full_script = f"""
-# Import necessary libraries
-import pandas as pd
-
-# Load the input data
-df = pd.read_csv(r"{self.input_csv_path}")
-
-# Define the transformation function
-{code_string}
-
-# Apply the transformation
-try:
-    df = transform_data(df)
-    # Save the result
-    df.to_csv(r"{self.output_csv_path}", index=False)
-    print("Transformation completed successfully")
-except Exception as e:
-    import traceback
-    print(f"Error during transformation: {{str(e)}}")
-    print(traceback.format_exc())
-    exit(1)
-"""
+            # The fingerprint identifies input_df's current contents in the result
+            # cache and in the worker, which may already hold the same data
+            if frame_key is None:
+                frame_key = fingerprint_dataframe(input_df)
             
-            # Write the script to a file
-            with open(self.script_path, 'w') as f:
-                f.write(full_script)
-            
-            # Execute the script in a subprocess
-            result = subprocess.run(
-                ["python", str(self.script_path)],
-                capture_output=True,
-                text=True,
-                check=False  # We'll handle errors ourselves
-            )
-            
-            # Check if the execution was successful
-            if result.returncode == 0 and self.output_csv_path.exists():
-                # Read the output DataFrame
-                output_df = pd.read_csv(self.output_csv_path)
+            # Return the cached result if this code already ran on this data
+            cache_key = self._cache_key(code_string, frame_key)
+            cached_df = self._cache_get(cache_key)
+            if cached_df is not None:
                 return {
                     'status': 'success',
-                    'dataframe': output_df,
-                    'stdout': result.stdout
-                }
-            else:
-                # Return the error information
-                return {
-                    'status': 'error',
-                    'traceback': result.stderr or result.stdout,  # Sometimes errors are in stdout
-                    'returncode': result.returncode
+                    'dataframe': cached_df,
+                    'stdout': '',
+                    'cached': True
                 }
+            
+            # Simple pandas/numpy code runs in this process, skipping the worker round-trip
+            if self._is_safe(code_string):
+                response = self._execute_in_process(code_string, input_df)
+                if response is not None:
+                    if response['status'] == 'success':
+                        self._cache_put(cache_key, response['dataframe'])
+                    return response
+            
+            with self._worker_slots:
+                worker = self._acquire_worker(frame_key)
+                try:
+                    response = None
+                    if frame_key is not None and worker.frame_key == frame_key:
+                        # The worker already holds this DataFrame, only send the code
+                        response = worker.request({
+                            'code': code_string,
+                            'frame_key': frame_key,
+                            'dataframe': None
+                        })
+                    
+                    if response is None or response['status'] == 'missing_frame':
+                        response = worker.request({
+                            'code': code_string,
+                            'frame_key': frame_key,
+                            'dataframe': input_df
+                        })
+                except Exception:
+                    # The worker may be mid-message, don't reuse it
+                    worker.close()
+                    raise
+                
+                if response is None:
+                    # The worker exited before answering
+                    returncode = worker.process.wait()
+                    return {
+                        'status': 'error',
+                        'traceback': f"Execution process exited unexpectedly with return code {returncode}",
+                        'returncode': returncode
+                    }
+                
+                # Remember what the worker holds now: the result, or the input after an error
+                if response['status'] == 'success':
+                    worker.frame_key = response.pop('fingerprint')
+                else:
+                    worker.frame_key = frame_key
+                self._release_worker(worker)
+            
+            if response['status'] == 'success':
+                self._cache_put(cache_key, response['dataframe'])
+            
+            return response
         
         except Exception as e:
             # Handle any exceptions in the execution process itself
@@ -111,22 +292,337 @@ except Exception as e:
                 'traceback': f"Error in code execution process: {str(e)}\n{traceback.format_exc()}"
             }
     
-    def cleanup(self):
+    @staticmethod
+    def _is_safe(code_string: str) -> bool:
         """
-        Clean up temporary files created during execution.
+        Check whether generated code is simple enough to run without process isolation.
+        
+        The check is an allow-list:
+        - names must be bound by the code itself, be pd/np (or an import of
+          SAFE_IMPORTS), or be one of SAFE_BUILTINS;
+        - modules may only be used as pd.<name> or np.<name> for the names in
+          SAFE_PANDAS_FUNCTIONS, SAFE_PANDAS_CLASSES and SAFE_NUMPY_NAMES, with
+          pandas classes only called or used in isinstance checks;
+        - attributes of the code's own objects may not be private, UNSAFE_ATTRIBUTES,
+          or I/O methods (read_*, to_* other than SAFE_TO_METHODS), nor may string
+          literals name such attributes (e.g. df.agg('to_csv'));
+        - STRING_DISPATCH_METHODS may only be called, and their arguments (like
+          STRING_DISPATCH_KEYWORDS of any call) may only be literals, lambdas,
+          functions the code defines, builtins and pd./np. names, or containers of
+          those, so no string built at runtime (e.g. 't' + 'o_csv') names a method;
+        - assignments and deletions may only target the code's own names, items of
+          its own objects, or their ASSIGNABLE_ATTRIBUTES.
+        
+        Args:
+            code_string (str): The generated code
+            
+        Returns:
+            bool: True if the code can run in-process
         """
         try:
-            # Remove temporary files if they exist
-            if self.input_csv_path.exists():
-                self.input_csv_path.unlink()
+            tree = ast.parse(code_string)
+        except SyntaxError:
+            return False
+        
+        def is_unsafe_attribute(name: str) -> bool:
+            if name.startswith("_") or name in UNSAFE_ATTRIBUTES or name.startswith("read_"):
+                return True
+            return name.startswith("to_") and name not in SAFE_TO_METHODS
+        
+        # Modules the code can reach, by the name they are bound to
+        modules = {"pd": "pandas", "np": "numpy"}
+        defined_names = set()
+        # Names bound by a def and never rebound are known to hold the code's own functions
+        function_names = set()
+        variable_names = set()
+        parents = {}
+        for node in ast.walk(tree):
+            for child in ast.iter_child_nodes(node):
+                parents[child] = node
+            
+            if isinstance(node, (ast.Global, ast.Nonlocal, ast.ClassDef, ast.AsyncFunctionDef,
+                                 ast.With, ast.AsyncWith, ast.Await, ast.Yield, ast.YieldFrom,
+                                 ast.ImportFrom)):
+                return False
+            if isinstance(node, ast.FunctionDef):
+                function_names.add(node.name)
+            elif isinstance(node, ast.arg):
+                variable_names.add(node.arg)
+            elif isinstance(node, ast.Name) and not isinstance(node.ctx, ast.Load):
+                variable_names.add(node.id)
+            elif isinstance(node, ast.ExceptHandler) and node.name:
+                variable_names.add(node.name)
+            elif isinstance(node, ast.Import):
+                for alias in node.names:
+                    if alias.name not in SAFE_IMPORTS:
+                        return False
+                    modules[alias.asname or alias.name] = alias.name
+        
+        defined_names = function_names | variable_names
+        
+        # A module name the code also binds to something else could hold anything
+        if defined_names & modules.keys():
+            return False
+        
+        def is_class_use(node) -> bool:
+            parent = parents.get(node)
+            if isinstance(parent, ast.Call) and parent.func is node:
+                return True
+            if isinstance(parent, ast.Tuple):
+                node, parent = parent, parents.get(parent)
+            return (isinstance(parent, ast.Call) and isinstance(parent.func, ast.Name)
+                    and parent.func.id == "isinstance" and node in parent.args[1:])
+        
+        def root_of(node):
+            while isinstance(node, (ast.Attribute, ast.Subscript)):
+                node = node.value
+            return node
+        
+        def is_own_name(node) -> bool:
+            return isinstance(node, ast.Name) and node.id in defined_names
+        
+        def is_fixed_function(node) -> bool:
+            # Values known before the code runs, so never a string built at runtime
+            if isinstance(node, ast.Constant):
+                # Even single-underscore names would be looked up as methods here
+                return not (isinstance(node.value, str) and node.value.isidentifier()
+                            and is_unsafe_attribute(node.value))
+            if isinstance(node, ast.Lambda):
+                return True
+            if isinstance(node, ast.Name):
+                if node.id in function_names:
+                    return node.id not in variable_names
+                return node.id in modules or (node.id in SAFE_BUILTINS and node.id not in defined_names)
+            if isinstance(node, ast.Attribute):
+                # e.g. np.mean or str.lower; the attribute itself is checked like any other
+                return isinstance(node.value, ast.Name) and is_fixed_function(node.value)
+            if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+                return all(is_fixed_function(element) for element in node.elts)
+            if isinstance(node, ast.Dict):
+                return (all(key is None or is_fixed_function(key) for key in node.keys)
+                        and all(is_fixed_function(value) for value in node.values))
+            if isinstance(node, ast.Call):
+                # Named aggregations, e.g. agg(total=pd.NamedAgg('a', 'sum'))
+                return (isinstance(node.func, ast.Attribute) and node.func.attr == "NamedAgg"
+                        and is_fixed_function(node.func.value)
+                        and all(is_fixed_function(arg) for arg in node.args)
+                        and all(is_fixed_function(keyword.value) for keyword in node.keywords))
+            return False
+        
+        # Check every name, attribute, assignment target and string the code uses
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
+                if node.id in modules:
+                    # Modules may only appear as the root of an allowed pd./np. attribute
+                    if not isinstance(parents.get(node), ast.Attribute):
+                        return False
+                elif node.id not in defined_names and node.id not in SAFE_BUILTINS:
+                    return False
             
-            if self.output_csv_path.exists():
-                self.output_csv_path.unlink()
+            elif isinstance(node, ast.Attribute):
+                if isinstance(node.value, ast.Name) and node.value.id in modules:
+                    if not isinstance(node.ctx, ast.Load) or isinstance(parents.get(node), ast.Attribute):
+                        return False
+                    if modules[node.value.id] == "numpy":
+                        if node.attr not in SAFE_NUMPY_NAMES:
+                            return False
+                    elif node.attr in SAFE_PANDAS_CLASSES:
+                        if not is_class_use(node):
+                            return False
+                    elif node.attr not in SAFE_PANDAS_FUNCTIONS:
+                        return False
+                elif is_unsafe_attribute(node.attr):
+                    return False
+                elif node.attr in STRING_DISPATCH_METHODS:
+                    # Only call these directly, with arguments that can't be computed strings
+                    call = parents.get(node)
+                    if not isinstance(call, ast.Call) or call.func is not node:
+                        return False
+                    if not all(is_fixed_function(arg) for arg in call.args):
+                        return False
+                    if not all(is_fixed_function(keyword.value) for keyword in call.keywords):
+                        return False
+                elif not isinstance(node.ctx, ast.Load):
+                    if node.attr not in ASSIGNABLE_ATTRIBUTES or not is_own_name(root_of(node)):
+                        return False
             
-            if self.script_path.exists():
-                self.script_path.unlink()
-                
-            print("Temporary files cleaned up successfully")
+            elif isinstance(node, ast.Subscript) and not isinstance(node.ctx, ast.Load):
+                if not is_own_name(root_of(node)):
+                    return False
+            
+            elif isinstance(node, ast.keyword) and node.arg in STRING_DISPATCH_KEYWORDS:
+                # e.g. pd.pivot_table(..., aggfunc=...)
+                if not is_fixed_function(node.value):
+                    return False
+            
+            elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+                # Single-underscore strings are common labels (e.g. add_suffix('_copy'))
+                name = node.value
+                if name.isidentifier() and is_unsafe_attribute(name) and (name.startswith("__") or not name.startswith("_")):
+                    return False
+        
+        return True
+    
+    @staticmethod
+    def _execute_in_process(code_string: str, input_df: pd.DataFrame):
+        """
+        Run code that passed _is_safe in this process, on a copy of the input.
+
+        Args:
+            code_string (str): The generated code
+            input_df (pd.DataFrame): The input DataFrame, which is left unmodified
+
+        Returns:
+            dict: A response in the same format as execute_code, or None if the code
+                  failed before transform_data was called
+        """
+        def safe_import(name, globals=None, locals=None, fromlist=(), level=0):
+            if level or name.partition(".")[0] not in SAFE_IMPORTS:
+                raise ImportError(f"Import of {name} is not allowed")
+            return __import__(name, globals, locals, fromlist, level)
+        
+        safe_builtins = {name: getattr(builtins, name) for name in SAFE_BUILTINS}
+        safe_builtins["__import__"] = safe_import
+        namespace = {"__builtins__": safe_builtins, "pd": pd, "np": np}
+        
+        try:
+            exec(compile_code(code_string), namespace)
+            transform_data = namespace["transform_data"]
+        except Exception:
+            return None
+        
+        try:
+            output_df = transform_data(input_df.copy())
+            if not isinstance(output_df, pd.DataFrame):
+                raise TypeError(f"transform_data must return a pandas DataFrame, got {type(output_df).__name__}")
+        except Exception:
+            import traceback
+            return {
+                'status': 'error',
+                'traceback': traceback.format_exc()
+            }
+        
+        return {
+            'status': 'success',
+            'dataframe': output_df,
+            'stdout': ''
+        }
+    
+    def _acquire_worker(self, frame_key=None) -> _Worker:
+        """
+        Take an idle worker from the pool, starting a new one if none is available.
+
+        Args:
+            frame_key (str): Fingerprint of the DataFrame to run on; a worker already
+                             holding that DataFrame is preferred
+
+        Returns:
+            _Worker: A running worker
+        """
+        with self._lock:
+            for index, worker in enumerate(self._idle_workers):
+                if frame_key is not None and worker.frame_key == frame_key and worker.is_alive():
+                    return self._idle_workers.pop(index)
+            while self._idle_workers:
+                worker = self._idle_workers.pop()
+                if worker.is_alive():
+                    return worker
+                worker.close()
+        return _Worker(self.temp_dir)
+    
+    def _release_worker(self, worker: _Worker):
+        """
+        Return a worker to the pool, discarding it if it has exited.
+        """
+        if worker.is_alive():
+            with self._lock:
+                self._idle_workers.append(worker)
+    
+    @staticmethod
+    def _cache_key(code_string: str, fingerprint: str):
+        """
+        Build the result cache key for running some code on a DataFrame.
+
+        Args:
+            code_string (str): The generated code
+            fingerprint (str): Fingerprint of the DataFrame the code runs on
+
+        Returns:
+            str: The cache key, or None if the DataFrame couldn't be fingerprinted
+        """
+        if fingerprint is None:
+            return None
+        
+        digest = hashlib.sha256(code_string.encode())
+        digest.update(fingerprint.encode())
+        return digest.hexdigest()
+    
+    def _cache_get(self, key):
+        """
+        Load a cached result DataFrame and mark it as recently used.
+
+        Returns:
+            pd.DataFrame: The cached DataFrame, or None on a cache miss
+        """
+        with self._lock:
+            path = self._cache_index.get(key)
+        if path is None:
+            return None
+        
+        try:
+            with open(path, 'rb') as f:
+                df = pickle.load(f)
+            os.utime(path)
+        except Exception:
+            # Unreadable or concurrently evicted entry, drop it and treat as a miss
+            with self._lock:
+                self._cache_index.pop(key, None)
+            path.unlink(missing_ok=True)
+            return None
+        
+        with self._lock:
+            if key in self._cache_index:
+                self._cache_index.move_to_end(key)
+        return df
+    
+    def _cache_put(self, key, df: pd.DataFrame):
+        """
+        Store a result DataFrame in the cache, evicting the least recently used entries.
+        """
+        if key is None:
+            return
+        
+        path = self._cache_dir / f"{key}.pkl"
+        temp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            with open(temp_path, 'wb') as f:
+                pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+        except Exception as e:
+            temp_path.unlink(missing_ok=True)
+            print(f"Error caching execution result: {str(e)}")
+            return
+        
+        with self._lock:
+            self._cache_index[key] = path
+            self._cache_index.move_to_end(key)
+            evicted_paths = []
+            while len(self._cache_index) > self.cache_size:
+                evicted_paths.append(self._cache_index.popitem(last=False)[1])
+        for evicted_path in evicted_paths:
+            evicted_path.unlink(missing_ok=True)
+    
+    def cleanup(self):
+        """
+        Shut down the idle worker processes. New ones are started if code is executed again.
+        """
+        try:
+            with self._lock:
+                workers, self._idle_workers = self._idle_workers, []
+            for worker in workers:
+                worker.close()
             
+            print("Execution workers shut down successfully")
+        
         except Exception as e:
-            print(f"Error cleaning up temporary files: {str(e)}")
\ No newline at end of file
+            print(f"Error shutting down execution workers: {str(e)}")
@@ -0,0 +1,195 @@
+"""
+Worker process used by CodeExecutor.
+
+The worker is started once and then serves requests until its stdin is closed.
+Each request and response is a pickled dictionary prefixed with its length, so
+DataFrames travel between the processes without any text serialization.
+"""
+import io
+import hashlib
+import linecache
+import os
+import pickle
+import struct
+import sys
+import traceback
+from collections import OrderedDict
+from contextlib import redirect_stderr, redirect_stdout
+
+# Imported once when the worker starts, so requests don't pay for it
+import numpy as np
+import pandas as pd
+
+# Every message is preceded by its payload size as an unsigned 64-bit integer
+HEADER = struct.Struct(">Q")
+
+# Compiled code objects of recently executed code, keyed by a hash of the source
+COMPILED_CACHE_SIZE = 64
+_compiled_code = OrderedDict()
+
+# (fingerprint, DataFrame) of the frame this worker holds for the next request
+_held_frame = (None, None)
+
+def write_message(stream, message: dict):
+    """
+    Pickle a message and write it to a binary stream with a length prefix.
+
+    Args:
+        stream: A writable binary stream
+        message (dict): The message to send
+    """
+    payload = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+    stream.write(HEADER.pack(len(payload)))
+    stream.write(payload)
+    stream.flush()
+
+def read_message(stream):
+    """
+    Read one length-prefixed pickled message from a binary stream.
+
+    Args:
+        stream: A readable binary stream
+
+    Returns:
+        dict: The decoded message, or None if the stream was closed
+    """
+    header = stream.read(HEADER.size)
+    if len(header) < HEADER.size:
+        return None
+    
+    (length,) = HEADER.unpack(header)
+    payload = stream.read(length)
+    if len(payload) < length:
+        return None
+    
+    return pickle.loads(payload)
+
+def fingerprint_dataframe(df: pd.DataFrame):
+    """
+    Compute a content fingerprint of a DataFrame from its row hashes, shape, columns and dtypes.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to fingerprint
+
+    Returns:
+        str: A hex digest, or None if the DataFrame contains unhashable values
+    """
+    try:
+        row_hashes = pd.util.hash_pandas_object(df, index=True).values
+    except TypeError:
+        return None
+    
+    digest = hashlib.blake2b(row_hashes.tobytes(), digest_size=20)
+    digest.update(repr((df.shape, list(df.columns), [str(dtype) for dtype in df.dtypes])).encode())
+    return digest.hexdigest()
+
+def compile_code(code_string: str):
+    """
+    Compile generated code, reusing the code object if the same source ran recently.
+
+    Debug retries and cached reruns often send identical code, which then
+    skips parsing and compilation. The source is registered with linecache so
+    tracebacks show the offending lines of the generated code.
+
+    Args:
+        code_string (str): The source code to compile
+
+    Returns:
+        code: The compiled code object
+    """
+    key = hashlib.sha1(code_string.encode()).hexdigest()
+    code = _compiled_code.get(key)
+    if code is None:
+        filename = f"<generated-{key[:12]}>"
+        linecache.cache[filename] = (len(code_string), None, code_string.splitlines(True), filename)
+        code = compile(code_string, filename, "exec")
+        _compiled_code[key] = code
+        if len(_compiled_code) > COMPILED_CACHE_SIZE:
+            _, evicted_code = _compiled_code.popitem(last=False)
+            linecache.cache.pop(evicted_code.co_filename, None)
+    else:
+        _compiled_code.move_to_end(key)
+    return code
+
+def run_request(request: dict) -> dict:
+    """
+    Apply the transform_data function defined in the request's code to a DataFrame.
+
+    The worker holds on to the last DataFrame it was sent or produced, under its
+    fingerprint. A request whose 'dataframe' is None runs on that held frame
+    instead, so debug retries and consecutive tasks don't resend the data.
+
+    Args:
+        request (dict): A dictionary with 'code', 'dataframe' and 'frame_key' keys
+
+    Returns:
+        dict: A response in the same format as CodeExecutor.execute_code, plus the
+              'fingerprint' of the resulting DataFrame on success, or
+              {'status': 'missing_frame'} if the held frame doesn't match 'frame_key'
+    """
+    global _held_frame
+    
+    df = request["dataframe"]
+    if df is None:
+        held_key, df = _held_frame
+        if held_key is None or held_key != request["frame_key"]:
+            return {'status': 'missing_frame'}
+    elif request["frame_key"] is not None:
+        _held_frame = (request["frame_key"], df)
+    
+    captured = io.StringIO()
+    try:
+        with redirect_stdout(captured), redirect_stderr(captured):
+            namespace = {"pd": pd, "np": np}
+            exec(compile_code(request["code"]), namespace)
+            # Work on a copy so the held frame stays intact for a retry
+            df = namespace["transform_data"](df.copy())
+        
+        if not isinstance(df, pd.DataFrame):
+            raise TypeError(f"transform_data must return a pandas DataFrame, got {type(df).__name__}")
+    
+    except (Exception, SystemExit):
+        return {
+            'status': 'error',
+            'traceback': traceback.format_exc()
+        }
+    
+    # Hold the result, as it is most likely the input of the next task
+    fingerprint = fingerprint_dataframe(df)
+    _held_frame = (fingerprint, df) if fingerprint is not None else (None, None)
+    
+    return {
+        'status': 'success',
+        'dataframe': df,
+        'fingerprint': fingerprint,
+        'stdout': captured.getvalue()
+    }
+
+def main():
+    """
+    Serve requests from stdin until the parent process closes the pipe.
+    """
+    # Keep private handles on the real stdin/stdout for the message stream and
+    # point file descriptor 1 at stderr, so nothing the generated code prints
+    # (or closes, as the exit() builtin does with stdin) can break the protocol
+    protocol_in = os.fdopen(os.dup(sys.stdin.fileno()), "rb")
+    protocol_out = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    
+    while True:
+        request = read_message(protocol_in)
+        if request is None:
+            break
+        
+        response = run_request(request)
+        try:
+            write_message(protocol_out, response)
+        except Exception as e:
+            # The result could not be pickled; report that instead of dying
+            write_message(protocol_out, {
+                'status': 'error',
+                'traceback': f"Error sending the result back to the executor: {str(e)}\n{traceback.format_exc()}"
+            })
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,9 @@
+import os
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from .state_manager import StateManager
 from .code_executor import CodeExecutor
+from .executor_worker import fingerprint_dataframe
 from . import profiler
 from ..agents import coder_agent
 from ..agents import debugger_agent
@@ -20,11 +24,15 @@ class Orchestrator:
     def __init__(self):
         """
         Initialize the Orchestrator with instances of StateManager and CodeExecutor.
+        
+        Set AUTODS_VERBOSE=1 to display generated code, fixes and full tracebacks
+        while a plan runs.
         """
         self.state_manager = StateManager()
         self.code_executor = CodeExecutor()
         self.execution_log = []
         self.console = Console()
+        self._verbose = os.getenv("AUTODS_VERBOSE", "0") == "1"
         
         self.console.print(Panel.fit(
             "[bold blue]AutoDS Orchestrator Initialized[/bold blue]\n"
@@ -40,144 +48,359 @@ class Orchestrator:
         The method implements a self-correction mechanism that attempts to debug and
         fix code that fails during execution.
         
+        Tasks that declare the columns they read and write are scheduled as a
+        dependency graph: tasks touching disjoint columns run concurrently on just
+        those columns and their results are merged back. Tasks without these
+        declarations act as barriers and run alone on the full DataFrame.
+        
         Args:
             plan (list): A list of task dictionaries, each containing 'id' and 'task' keys
+                         and optionally the 'code' implementing the task and the
+                         'reads'/'writes' lists of columns it uses
                          Example: [{'id': 1, 'task': 'Drop the "address" column'}]
         
         Returns:
             list: The execution log containing details of each task's execution
         """
-        self.console.print("[bold]Starting execution plan with", len(plan), "tasks[/bold]")
+        self.console.print(f"[bold]Starting execution plan with {len(plan)} tasks[/bold]")
         
-        # Iterate through each task in the plan
-        for task_item in plan:
-            task_id = task_item['id']
-            task_description = task_item['task']
-            
-            # Log the start of the task
-            self.console.print(f"\n[bold green]Executing Task {task_id}: {task_description}[/bold green]")
+        # Generate code in the background for tasks that came without any, so the
+        # LLM calls overlap with the execution of the tasks before them
+        with ThreadPoolExecutor(max_workers=2) as code_pool:
+            code_futures = {
+                task_item['id']: code_pool.submit(coder_agent.generate_code, task_item['task'])
+                for task_item in plan
+                if not task_item.get('code')
+            }
             
-            # Generate code for the task
-            self.console.print("[yellow]Generating code...[/yellow]")
-            try:
-                code_string = coder_agent.generate_code(task_description)
-                self.console.print("[green]Code generated successfully[/green]")
+            # Execute the plan stage by stage, running independent tasks in parallel
+            for stage in self._build_stages(plan):
+                if len(stage) > 1 and self._run_stage_in_parallel(stage):
+                    continue
                 
-                # Display the generated code
+                for task_item in stage:
+                    self._run_task(task_item, code_futures.get(task_item['id']))
+        
+        # Shut down the execution workers after all tasks are completed
+        self.code_executor.cleanup()
+        
+        # Make sure plots and reports saved during the run are on disk
+        self.state_manager.flush()
+        
+        # Print summary
+        success_count = sum(1 for log in self.execution_log if log['status'] == 'success')
+        total_tasks = len(plan)
+        
+        self.console.print(f"\n[bold]Execution plan completed: {success_count}/{total_tasks} tasks successful[/bold]")
+        
+        return self.execution_log
+    
+    def _run_task(self, task_item: dict, code_future=None):
+        """
+        Run a single task on the full DataFrame and update the state with its result.
+        
+        Args:
+            task_item (dict): The task to run
+            code_future (Future): Pending code generation for a task that has no code
+        """
+        task_id = task_item['id']
+        task_description = task_item['task']
+        
+        # Log the start of the task
+        self.console.print(f"\n[bold green]Executing Task {task_id}: {task_description}[/bold green]")
+        
+        # Use the code that came with the plan, generating it only if missing
+        try:
+            code_string = task_item.get('code')
+            if not code_string:
+                self.console.print("[yellow]Generating code...[/yellow]")
+                if code_future is not None:
+                    code_string = code_future.result()
+                else:
+                    code_string = coder_agent.generate_code(task_description)
+            
+            # Display the generated code
+            if self._verbose:
                 self.console.print(Panel(
                     code_string,
                     title="[bold]Generated Code[/bold]",
                     border_style="green",
                     expand=False
                 ))
+        
+        except Exception as e:
+            error_msg = f"Error generating code: {str(e)}"
+            self.console.print(f"[bold red]{error_msg}[/bold red]")
+            self.execution_log.append({
+                'task_id': task_id,
+                'task': task_description,
+                'status': 'failed',
+                'error': error_msg,
+                'stage': 'code_generation'
+            })
+            return
+        
+        # Get the current DataFrame
+        current_df = self.state_manager.get_dataframe()
+        if current_df is None:
+            self.console.print("[bold red]Error: No DataFrame available for processing[/bold red]")
+            self.execution_log.append({
+                'task_id': task_id,
+                'task': task_description,
+                'status': 'failed',
+                'error': 'No DataFrame available',
+                'stage': 'execution'
+            })
+            return
+        
+        log_entry, result_df = self._execute_with_retries(task_item, code_string, current_df)
+        
+        if result_df is not None:
+            # Update the state with the new DataFrame
+            self.state_manager.update_dataframe(result_df)
+        else:
+            self.console.print("[bold red]All attempts failed. Moving to the next task.[/bold red]")
+        
+        self.execution_log.append(log_entry)
+    
+    def _execute_with_retries(self, task_item: dict, code_string: str, input_df, max_attempts: int = 3):
+        """
+        Execute a task's code, asking the debugger agent to fix it after each failure.
+        
+        Args:
+            task_item (dict): The task being executed
+            code_string (str): The initial code for the task
+            input_df (pandas.DataFrame): The DataFrame to run the code on
+            max_attempts (int): Maximum number of executions before giving up
+        
+        Returns:
+            tuple: The execution log entry and the resulting DataFrame (None if all attempts failed)
+        """
+        task_id = task_item['id']
+        task_description = task_item['task']
+        
+        # Hashes of the code versions already tried, to spot fixes that change nothing
+        tried_code = {hashlib.sha1(code_string.encode()).hexdigest()}
+        # The input doesn't change between attempts, so it is only fingerprinted once
+        frame_key = fingerprint_dataframe(input_df)
+        # Executions actually run, fewer than max_attempts if the debugger converges
+        attempts_made = 0
+        
+        # Execution attempt loop
+        for attempt in range(max_attempts):
+            # Execute the code
+            result = self.code_executor.execute_code(code_string, input_df, frame_key=frame_key)
+            attempts_made = attempt + 1
+            
+            # Check execution result
+            if result['status'] == 'success':
+                self.console.log(f"[green]✓ Task {task_id} (attempt {attempt + 1}/{max_attempts})[/green]")
                 
-            except Exception as e:
-                error_msg = f"Error generating code: {str(e)}"
-                self.console.print(f"[bold red]{error_msg}[/bold red]")
-                self.execution_log.append({
+                log_entry = {
                     'task_id': task_id,
                     'task': task_description,
-                    'status': 'failed',
-                    'error': error_msg,
-                    'stage': 'code_generation'
-                })
-                continue  # Skip to the next task
+                    'code': code_string,
+                    'status': 'success',
+                    'attempt': attempt + 1
+                }
+                return log_entry, result['dataframe']
             
-            # Execution attempt loop (try up to 3 times)
-            for attempt in range(3):
-                self.console.print(f"[bold]Execution attempt {attempt + 1}/3[/bold]")
-                
-                # Get the current DataFrame
-                current_df = self.state_manager.get_dataframe()
-                if current_df is None:
-                    self.console.print("[bold red]Error: No DataFrame available for processing[/bold red]")
-                    self.execution_log.append({
-                        'task_id': task_id,
-                        'task': task_description,
-                        'status': 'failed',
-                        'error': 'No DataFrame available',
-                        'stage': 'execution'
-                    })
-                    break  # Skip to the next task
-                
-                # Execute the code
-                self.console.print("[yellow]Executing code...[/yellow]")
-                result = self.code_executor.execute_code(code_string, current_df)
+            error_traceback = result['traceback']
+            self.console.print(f"[bold red]✗ Execution failed (Attempt {attempt + 1}/{max_attempts})[/bold red]")
+            
+            # Display the error, or just its last line when not verbose
+            if self._verbose:
+                self.console.print(Panel(
+                    error_traceback,
+                    title="[bold red]Error Traceback[/bold red]",
+                    border_style="red",
+                    expand=False
+                ))
+            else:
+                error_lines = error_traceback.strip().splitlines()
+                self.console.print(error_lines[-1] if error_lines else error_traceback, style="red", markup=False)
+            
+            # If we have more attempts left, try debugging
+            if attempt < max_attempts - 1:
+                self.console.print("[yellow]Attempting to debug and fix the code...[/yellow]")
                 
-                # Check execution result
-                if result['status'] == 'success':
-                    self.console.print("[bold green]✓ Code executed successfully![/bold green]")
-                    
-                    # Update the state with the new DataFrame
-                    self.state_manager.update_dataframe(result['dataframe'])
-                    
-                    # Log the successful execution
-                    self.execution_log.append({
-                        'task_id': task_id,
-                        'task': task_description,
-                        'code': code_string,
-                        'status': 'success',
-                        'attempt': attempt + 1
-                    })
+                try:
+                    # Call the debugger agent to fix the code
+                    fixed_code = debugger_agent.fix_code(code_string, error_traceback)
                     
-                    # Break out of the attempt loop
-                    break
+                    # Rerunning code that already failed would fail the same way
+                    fixed_hash = hashlib.sha1(fixed_code.encode()).hexdigest()
+                    if fixed_hash in tried_code:
+                        self.console.print("[yellow]Debugger converged without progress, giving up on this task[/yellow]")
+                        break
+                    tried_code.add(fixed_hash)
+                    code_string = fixed_code  # Update the code for the next attempt
                     
-                else:  # Error occurred
-                    error_traceback = result['traceback']
-                    self.console.print(f"[bold red]✗ Execution failed (Attempt {attempt + 1}/3)[/bold red]")
-                    
-                    # Display the error
-                    self.console.print(Panel(
-                        error_traceback,
-                        title="[bold red]Error Traceback[/bold red]",
-                        border_style="red",
-                        expand=False
-                    ))
-                    
-                    # If we have more attempts left, try debugging
-                    if attempt < 2:  # We're on attempt 0 or 1 (out of 0, 1, 2)
-                        self.console.print("[yellow]Attempting to debug and fix the code...[/yellow]")
-                        
-                        try:
-                            # Call the debugger agent to fix the code
-                            fixed_code = debugger_agent.fix_code(code_string, error_traceback)
-                            code_string = fixed_code  # Update the code for the next attempt
-                            
-                            # Display the fixed code
-                            self.console.print(Panel(
-                                fixed_code,
-                                title="[bold]Fixed Code[/bold]",
-                                border_style="yellow",
-                                expand=False
-                            ))
-                            
-                        except Exception as e:
-                            debug_error = f"Error during debugging: {str(e)}"
-                            self.console.print(f"[bold red]{debug_error}[/bold red]")
-                    
-                    # If this was the last attempt and it failed
-                    if attempt == 2:
-                        self.console.print("[bold red]All attempts failed. Moving to the next task.[/bold red]")
-                        self.execution_log.append({
-                            'task_id': task_id,
-                            'task': task_description,
-                            'code': code_string,
-                            'status': 'failed',
-                            'error': error_traceback,
-                            'attempts': 3
-                        })
-        
-        # Clean up temporary files after all tasks are completed
-        self.code_executor.cleanup()
+                    # Display the fixed code
+                    if self._verbose:
+                        self.console.print(Panel(
+                            fixed_code,
+                            title="[bold]Fixed Code[/bold]",
+                            border_style="yellow",
+                            expand=False
+                        ))
+                
+                except Exception as e:
+                    debug_error = f"Error during debugging: {str(e)}"
+                    self.console.print(f"[bold red]{debug_error}[/bold red]")
         
-        # Print summary
-        success_count = sum(1 for log in self.execution_log if log['status'] == 'success')
-        total_tasks = len(plan)
+        log_entry = {
+            'task_id': task_id,
+            'task': task_description,
+            'code': code_string,
+            'status': 'failed',
+            'error': error_traceback,
+            'attempts': attempts_made
+        }
+        return log_entry, None
+    
+    def _run_stage_in_parallel(self, stage: list) -> bool:
+        """
+        Run mutually independent tasks concurrently, each on the columns it declared.
         
-        self.console.print(f"\n[bold]Execution plan completed: {success_count}/{total_tasks} tasks successful[/bold]")
+        Each task gets a single attempt. If any task fails or changes more than it
+        declared, nothing is applied so the caller can rerun the stage sequentially
+        with the full debugging loop.
         
-        return self.execution_log
+        Args:
+            stage (list): Tasks with disjoint column sets, as built by _build_stages
+        
+        Returns:
+            bool: True if all tasks succeeded and their results were merged into the state
+        """
+        current_df = self.state_manager.get_dataframe()
+        if current_df is None:
+            return False
+        
+        task_ids = ", ".join(str(task_item['id']) for task_item in stage)
+        self.console.print(f"\n[bold green]Executing Tasks {task_ids} in parallel[/bold green]")
+        for task_item in stage:
+            self.console.print(f"[green]Task {task_item['id']}: {task_item['task']}[/green]")
+        
+        # Give every task only the columns it reads or writes
+        input_slices = []
+        for task_item in stage:
+            columns = set(task_item['reads']) | set(task_item['writes'])
+            input_slices.append(current_df[[column for column in current_df.columns if column in columns]])
+        
+        with ThreadPoolExecutor(max_workers=min(len(stage), os.cpu_count() or 1)) as pool:
+            outcomes = list(pool.map(
+                lambda task_item, input_slice: self._execute_with_retries(
+                    task_item, task_item['code'], input_slice, max_attempts=1
+                ),
+                stage,
+                input_slices
+            ))
+        
+        # Splice every task's columns back into the full DataFrame
+        merged_df = current_df
+        for task_item, input_slice, (_, result_df) in zip(stage, input_slices, outcomes):
+            if result_df is not None:
+                merged_df = self._merge_task_result(merged_df, task_item, input_slice, result_df)
+            if result_df is None or merged_df is None:
+                self.console.print(
+                    f"[yellow]Task {task_item['id']} could not run in parallel, "
+                    "running the stage sequentially[/yellow]"
+                )
+                return False
+        
+        self.state_manager.update_dataframe(merged_df)
+        self.execution_log.extend(log_entry for log_entry, _ in outcomes)
+        return True
+    
+    @staticmethod
+    def _column_sets(task_item: dict):
+        """
+        Get the columns a task reads and writes.
+        
+        A task that declares no written columns is treated as needing the full
+        DataFrame, since on an empty slice it could only do nothing.
+        
+        Returns:
+            tuple: (reads, writes) sets, or None if the task must run alone on the full DataFrame
+        """
+        reads = task_item.get('reads')
+        writes = task_item.get('writes')
+        if not task_item.get('code') or not isinstance(reads, list) or not isinstance(writes, list):
+            return None
+        if not writes or '*' in reads or '*' in writes:
+            return None
+        return set(reads), set(writes)
+    
+    @classmethod
+    def _build_stages(cls, plan: list) -> list:
+        """
+        Group the plan's tasks into stages of mutually independent tasks.
+        
+        A task depends on an earlier one when either writes a column the other
+        reads or writes. Each task is placed in the stage after the latest task it
+        depends on, so running the stages in order gives the same result as
+        running the plan sequentially.
+        
+        Args:
+            plan (list): The plan's task dictionaries
+        
+        Returns:
+            list: A list of stages, each a list of tasks in plan order
+        """
+        column_sets = [cls._column_sets(task_item) for task_item in plan]
+        levels = []
+        for j, sets_j in enumerate(column_sets):
+            level = 0
+            for i in range(j):
+                sets_i = column_sets[i]
+                if (sets_i is None or sets_j is None
+                        or sets_i[1] & (sets_j[0] | sets_j[1])
+                        or sets_j[1] & sets_i[0]):
+                    level = max(level, levels[i] + 1)
+            levels.append(level)
+        
+        stages = [[] for _ in range(max(levels, default=-1) + 1)]
+        for task_item, level in zip(plan, levels):
+            stages[level].append(task_item)
+        return stages
+    
+    @staticmethod
+    def _merge_task_result(df, task_item: dict, input_slice, result_df):
+        """
+        Merge the result of a task that ran on a column subset back into the full DataFrame.
+        
+        Args:
+            df (pandas.DataFrame): The full DataFrame to merge into
+            task_item (dict): The task, with its declared 'writes'
+            input_slice (pandas.DataFrame): The columns the task was given
+            result_df (pandas.DataFrame): The DataFrame the task returned
+        
+        Returns:
+            pandas.DataFrame: The merged DataFrame, or None if the task added or removed
+            rows or changed columns it didn't declare
+        """
+        writes = set(task_item['writes'])
+        
+        if not result_df.index.equals(input_slice.index):
+            return None
+        
+        for column in input_slice.columns:
+            if column in writes:
+                continue
+            if column not in result_df.columns or not result_df[column].equals(input_slice[column]):
+                return None
+        
+        merged_df = df.drop(columns=[column for column in input_slice.columns if column not in result_df.columns])
+        for column in result_df.columns:
+            if column in input_slice.columns and column not in writes:
+                continue
+            if column not in input_slice.columns and column not in writes and column in merged_df.columns:
+                # An undeclared new column that clashes with another task's column
+                return None
+            merged_df[column] = result_df[column]
+        
+        return merged_df
     
     def run_full_pipeline(self, csv_path: str, user_context: str):
         """
@@ -1,40 +1,119 @@
+import numpy as np
 import pandas as pd
-import io
 
-def create_data_profile(df: pd.DataFrame) -> dict:
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional
+    njit = None
+
+# Maximum number of rows used for the descriptive statistics of a profile
+PROFILE_SAMPLE_SIZE = 200_000
+
+# Minimum number of rows for which missing values are counted with numba
+NUMBA_MIN_ROWS = 100_000
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _count_nans(values):
+        """
+        Count the NaNs in a 1D float array with a parallel reduction.
+        """
+        count = 0
+        for i in prange(values.shape[0]):
+            if np.isnan(values[i]):
+                count += 1
+        return count
+
+def _missing_counts(df: pd.DataFrame) -> pd.Series:
+    """
+    Count the missing values in every column of a DataFrame.
+    
+    When numba is installed and the frame is large, float64 columns are counted
+    with a parallel compiled kernel that reads the column's array in place
+    without materializing a boolean mask; all other columns use pandas.
+    
+    Args:
+        df: The DataFrame to inspect
+        
+    Returns:
+        A Series of missing value counts indexed by column
+    """
+    if njit is None or len(df) < NUMBA_MIN_ROWS:
+        return df.isna().sum()
+    
+    is_float = np.array([dtype == np.float64 for dtype in df.dtypes], dtype=bool)
+    if not is_float.any():
+        return df.isna().sum()
+    
+    other_positions = np.flatnonzero(~is_float)
+    counts = np.empty(df.shape[1], dtype=np.int64)
+    for position in np.flatnonzero(is_float):
+        counts[position] = _count_nans(df.iloc[:, position].to_numpy())
+    if len(other_positions):
+        counts[other_positions] = df.iloc[:, other_positions].isna().sum().to_numpy()
+    return pd.Series(counts, index=df.columns)
+
+def _describe(df: pd.DataFrame, include) -> dict:
+    """
+    Describe the columns of the given kind in compact 'split' form.
+    
+    Args:
+        df: The DataFrame to describe
+        include: The dtypes to describe, as accepted by DataFrame.describe
+        
+    Returns:
+        A dictionary with 'index' (statistic names), 'columns' and 'data' (one row per
+        statistic), or an empty dictionary if there are no such columns
+    """
+    if df.select_dtypes(include=include).shape[1] == 0:
+        return {}
+    return df.describe(include=include).round(3).to_dict(orient='split')
+
+def create_data_profile(df: pd.DataFrame, sample_size: int = PROFILE_SAMPLE_SIZE) -> dict:
     """
     Create a comprehensive profile of the input DataFrame.
     
+    The shape and missing value counts are exact. The descriptive statistics and
+    unique value counts are computed on a random sample of at most sample_size
+    rows, since they only feed an LLM prompt and don't need every row.
+    
     Args:
         df: A pandas DataFrame to be profiled
+        sample_size: Maximum number of rows to compute the descriptive statistics on
         
     Returns:
         A dictionary containing key statistics and information about the DataFrame
     """
-    # Capture df.info() output as a string
-    buffer = io.StringIO()
-    df.info(buf=buffer)
-    info_string = buffer.getvalue()
-    
-    # Calculate missing values
-    missing_values = {}
-    for column in df.columns:
-        missing_count = df[column].isna().sum()
-        missing_percentage = (missing_count / len(df)) * 100
-        missing_values[column] = {
-            "count": int(missing_count),
-            "percentage": round(missing_percentage, 2)
+    # Calculate missing values for all columns in a single pass
+    missing_counts = _missing_counts(df)
+    row_count = len(df)
+    missing_values = {
+        column: {
+            "count": int(missing_counts[column]),
+            "percentage": round(float(missing_counts[column]) * 100.0 / row_count, 2) if row_count else 0.0
         }
+        for column in df.columns
+    }
+    
+    # Summarize column types and non-null counts
+    data_types = {
+        column: {"dtype": str(dtype), "non_null": row_count - int(missing_counts[column])}
+        for column, dtype in df.dtypes.items()
+    }
+    
+    # Sample large frames for the heavier statistics
+    sample = df.sample(n=sample_size, random_state=0) if row_count > sample_size else df
     
     # Create the profile dictionary
     profile = {
         "shape": df.shape,
-        "sample_head": df.head(5).to_dict(orient='records'),
-        "data_types": info_string,
+        "sample_head": df.head(5).to_dict(orient='split', index=False),
+        "data_types": data_types,
         "missing_values": missing_values,
-        "numeric_description": df.describe(include='number').to_dict(),
-        "categorical_description": df.describe(include='object').to_dict(),
-        "unique_values": {column: df[column].nunique() for column in df.columns}
+        "sample_size": len(sample),
+        "numeric_description": _describe(sample, 'number'),
+        "categorical_description": _describe(sample, ['object', 'category']),
+        "unique_values": sample.nunique().to_dict()
     }
     
     return profile
\ No newline at end of file
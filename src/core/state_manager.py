@@ -1,7 +1,370 @@
+import bz2
+import glob
+import gzip
+import hashlib
+import io
+import itertools
+import json
+import lzma
+import numpy as np
 import pandas as pd
 from pathlib import Path
-from datetime import datetime
+import time
 import os
+import logging
+import weakref
+from concurrent.futures import ThreadPoolExecutor, wait
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+# Directory holding the outputs of all runs
+_BASE_OUTPUT_DIR = Path(__file__).resolve().parents[2] / 'outputs'
+
+# CSV files larger than this many bytes are read in chunks when PyArrow can't read them
+CHUNKED_READ_THRESHOLD = 200 * 1024 * 1024
+
+# Number of rows per chunk when a CSV file is read in chunks
+CSV_CHUNK_SIZE = 1_000_000
+
+# Openers for compressed CSV files whose first lines are read on their own
+CSV_LINE_OPENERS = {'.gz': gzip.open, '.bz2': bz2.open, '.xz': lzma.open}
+
+def _read_csv_with_arrow(file_path: str, row_limit=None, **read_options):
+    """
+    Read a CSV file, or its first rows, with pandas' PyArrow engine.
+    
+    A row_limit is applied by parsing the header and the first row_limit lines
+    as a CSV file of their own, so the rows get the dtypes the engine infers for
+    them (e.g. timestamps) just as in a full read. The PyArrow engine doesn't
+    allow newlines inside quoted values, so every line holds at most one row;
+    more lines are read while blank lines leave the result short. Remote files,
+    and compressed files without an entry in CSV_LINE_OPENERS, are read whole
+    and cut to row_limit.
+    
+    Args:
+        file_path (str): Path to the CSV file to read
+        row_limit (int): Stop reading after this many rows (None reads the whole file)
+        **read_options: Extra keyword arguments for pandas.read_csv
+        
+    Returns:
+        pandas.DataFrame: The loaded DataFrame
+        
+    Raises:
+        ImportError: If PyArrow isn't installed
+        ValueError: If the PyArrow engine can't parse the file or handle the options
+    """
+    lower_path = os.fspath(file_path).lower()
+    suffix = next((suffix for suffix in PANDAS_COMPRESSION_SUFFIXES if lower_path.endswith(suffix)), None)
+    opener = open if suffix is None else CSV_LINE_OPENERS.get(suffix)
+    if row_limit is None or opener is None or not os.path.isfile(file_path):
+        df = pd.read_csv(file_path, engine="pyarrow", **read_options)
+        return df if row_limit is None else df.iloc[:row_limit].copy()
+    
+    with opener(file_path, 'rb') as f:
+        lines = [f.readline()]
+        missing_rows = row_limit
+        while True:
+            new_lines = list(itertools.islice(f, missing_rows))
+            lines.extend(new_lines)
+            df = pd.read_csv(io.BytesIO(b"".join(lines)), engine="pyarrow", **read_options)
+            at_end = len(new_lines) < missing_rows
+            # Blank lines hold no rows, so read as many more lines as rows are missing
+            missing_rows = row_limit - len(df)
+            if missing_rows <= 0 or at_end:
+                return df
+
+def _read_csv_in_chunks(file_path: str, row_limit=None, **read_options):
+    """
+    Read a CSV file with the C engine in chunks and concatenate them.
+    
+    Args:
+        file_path (str): Path to the CSV file to read
+        row_limit (int): Stop reading after this many rows (None reads the whole file)
+        **read_options: Extra keyword arguments for pandas.read_csv
+        
+    Returns:
+        pandas.DataFrame: The loaded DataFrame
+    """
+    chunk_size = CSV_CHUNK_SIZE if row_limit is None else max(1, min(CSV_CHUNK_SIZE, row_limit))
+    with pd.read_csv(
+        file_path,
+        engine="c",
+        low_memory=False,
+        cache_dates=True,
+        memory_map=os.path.isfile(file_path),
+        chunksize=chunk_size,
+        nrows=row_limit,
+        **read_options
+    ) as reader:
+        chunks = list(reader)
+    
+    if not chunks:
+        return pd.read_csv(file_path, nrows=0, **read_options)
+    return pd.concat(chunks, ignore_index=True, copy=False)
+
+# Buffer size used when writing reports, so large reports take few write calls
+REPORT_BUFFER_SIZE = 1 << 20
+
+# Number of rows formatted at a time when writing a CSV file
+CSV_WRITE_CHUNK_SIZE = 100_000
+
+# Compression the Arrow CSV writer applies to files saved with these extensions
+CSV_COMPRESSION = {'.gz': 'gzip', '.zst': 'zstd'}
+
+# Compression levels used for CSV files by both the Arrow and the pandas writer
+CSV_COMPRESSION_LEVELS = {'gzip': 9, 'zstd': 3}
+
+# Suffixes pandas infers compression from, tar archives first
+PANDAS_COMPRESSION_SUFFIXES = ('.tar', '.tar.gz', '.tar.bz2', '.tar.xz', '.gz', '.bz2', '.zip', '.xz', '.zst')
+
+# Schema metadata key of a sidecar holding the dtypes of the DataFrame it was written from
+SIDECAR_DTYPES_KEY = b'autods.dtypes'
+
+def _sidecar_path(file_path: str, **read_options):
+    """
+    Return the path of the Parquet copy of a local CSV file for the given read options.
+    
+    The sidecar lives next to the CSV file. Its name contains a hash of the read
+    options followed by a hash of the file's modification time and size, so it
+    no longer matches once the CSV file changes, and each set of read options
+    has a sidecar of its own.
+    
+    Args:
+        file_path (str): Path to the CSV file
+        **read_options: The options the CSV file is read with
+        
+    Returns:
+        Path: The sidecar path, or None if file_path is not a local file
+    """
+    if not os.path.isfile(file_path):
+        return None
+    
+    stat = os.stat(file_path)
+    options_key = repr(sorted(read_options.items()))
+    file_key = repr((stat.st_mtime_ns, stat.st_size))
+    csv_path = Path(file_path)
+    options_hash = hashlib.sha1(options_key.encode()).hexdigest()[:16]
+    file_hash = hashlib.sha1(file_key.encode()).hexdigest()[:16]
+    return csv_path.with_name(f".{csv_path.name}.{options_hash}.{file_hash}.parquet")
+
+def _write_sidecar(df, sidecar: Path):
+    """
+    Write a DataFrame to a Parquet sidecar, deleting the sidecars written from
+    earlier versions of the CSV file. Sidecars of the current version written
+    for other read options are kept.
+    
+    Parquet has no second-resolution timestamps, so the DataFrame's dtypes are
+    stored with it for _read_sidecar to restore.
+    
+    Args:
+        df (pandas.DataFrame): The DataFrame loaded from the CSV file
+        sidecar (Path): The sidecar path returned by _sidecar_path
+    """
+    csv_prefix, _, file_hash, _ = sidecar.name.rsplit('.', 3)
+    temp_path = sidecar.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        for other_sidecar in sidecar.parent.glob(f"{glob.escape(csv_prefix)}.*.*.parquet"):
+            # Names are <csv_prefix>.<options hash>.<file hash>.parquet
+            other_parts = other_sidecar.name[len(csv_prefix) + 1:].split('.')
+            if len(other_parts) == 3 and other_parts[1] != file_hash:
+                other_sidecar.unlink(missing_ok=True)
+        
+        table = pa.Table.from_pandas(df)
+        dtypes = json.dumps([str(dtype) for dtype in df.dtypes]).encode()
+        table = table.replace_schema_metadata({**table.schema.metadata, SIDECAR_DTYPES_KEY: dtypes})
+        pq.write_table(table, temp_path, compression="zstd")
+        os.replace(temp_path, sidecar)
+    except Exception as e:
+        # The sidecar only speeds up later loads, so carry on without it
+        logger.warning("Could not cache CSV as Parquet: %s", e)
+        temp_path.unlink(missing_ok=True)
+
+def _read_sidecar(sidecar: Path):
+    """
+    Read a Parquet sidecar back into the DataFrame it was written from.
+    
+    Args:
+        sidecar (Path): The sidecar path returned by _sidecar_path
+        
+    Returns:
+        pandas.DataFrame: The DataFrame, with the dtypes it had when it was written
+        
+    Raises:
+        KeyError: If the sidecar doesn't record its dtypes
+    """
+    table = pq.read_table(sidecar)
+    dtypes = json.loads(table.schema.metadata[SIDECAR_DTYPES_KEY])
+    df = table.to_pandas()
+    for position, dtype in enumerate(dtypes):
+        # e.g. datetime64[s] columns, which come back as datetime64[ms]
+        if str(df.dtypes.iloc[position]) != dtype:
+            df.isetitem(position, df.iloc[:, position].astype(dtype))
+    return df
+
+def _write_csv(df, file_path):
+    """
+    Write a DataFrame to a CSV file without its index.
+    
+    Frames whose columns all read back unchanged from Arrow's CSV output (see
+    _arrow_csv_round_trips) are written by PyArrow's CSV writer. Arrow writes
+    whole-number floats without a decimal point and timestamps with nanoseconds,
+    so frames with such columns go to pandas instead, as do frames whose columns
+    aren't unique or that PyArrow can't convert, and all frames when PyArrow
+    isn't installed. Either way rows are converted and written
+    CSV_WRITE_CHUNK_SIZE at a time, so large frames don't need a second full copy
+    in memory. Files ending in .gz or .zst are compressed with gzip or zstd while
+    they are written; other compressed extensions (.bz2, .xz, .zip, .tar...) are
+    left to pandas, which infers the compression from the extension.
+    
+    Args:
+        df (pandas.DataFrame): The DataFrame to write
+        file_path: Path of the file to write
+    """
+    lower_path = os.fspath(file_path).lower()
+    suffix = next((suffix for suffix in PANDAS_COMPRESSION_SUFFIXES if lower_path.endswith(suffix)), None)
+    compression = CSV_COMPRESSION.get(suffix)
+    
+    if (pa is not None and df.columns.is_unique and (suffix is None or compression is not None)
+            and _arrow_csv_round_trips(df)):
+        try:
+            codec = pa.Codec(compression, compression_level=CSV_COMPRESSION_LEVELS[compression]) if compression else None
+            with pa.OSFile(str(file_path), 'wb') as sink:
+                # Each chunk is converted on its own (an empty frame still writes its
+                # header), so its types may differ from other chunks' without a cast.
+                # Compressed chunks are written as consecutive gzip members / zstd frames.
+                for start in range(0, max(len(df), 1), CSV_WRITE_CHUNK_SIZE):
+                    chunk = df.iloc[start:start + CSV_WRITE_CHUNK_SIZE]
+                    write_options = pacsv.WriteOptions(include_header=start == 0, quoting_style="needed")
+                    buffer = pa.BufferOutputStream()
+                    pacsv.write_csv(pa.RecordBatch.from_pandas(chunk, preserve_index=False), buffer, write_options=write_options)
+                    sink.write(codec.compress(buffer.getvalue()) if codec else buffer.getvalue())
+            return
+        except (pa.ArrowException, ValueError):
+            pass
+    
+    df.to_csv(
+        file_path,
+        index=False,
+        chunksize=CSV_WRITE_CHUNK_SIZE,
+        compression=_pandas_compression(compression)
+    )
+
+def _arrow_csv_round_trips(df) -> bool:
+    """
+    Check whether pandas reads a frame back with the same dtypes and values from
+    Arrow's CSV output as from to_csv's.
+    
+    That holds for integers, booleans (written as true/false) and strings (always
+    quoted), but not for floats or datetimes.
+    
+    Args:
+        df (pandas.DataFrame): The DataFrame to write
+        
+    Returns:
+        bool: True if every column is an integer, boolean or string column
+    """
+    for _, column in df.items():
+        if pd.api.types.is_integer_dtype(column.dtype) or pd.api.types.is_bool_dtype(column.dtype):
+            continue
+        if isinstance(column.dtype, pd.StringDtype):
+            continue
+        if column.dtype == object and pd.api.types.infer_dtype(column, skipna=True) in ('string', 'empty'):
+            continue
+        return False
+    return True
+
+def _pandas_compression(compression):
+    """
+    Build the to_csv compression argument for a CSV_COMPRESSION codec.
+    
+    Args:
+        compression (str): The codec name, or None to let pandas infer it from the extension
+        
+    Returns:
+        The compression argument, using the levels in CSV_COMPRESSION_LEVELS
+    """
+    if compression is None:
+        return 'infer'
+    level_argument = 'compresslevel' if compression == 'gzip' else 'level'
+    return {'method': compression, level_argument: CSV_COMPRESSION_LEVELS[compression]}
+
+def _drop_page_cache(file_path):
+    """
+    Advise the kernel that a file just written won't be read again soon.
+    
+    Its cached pages can then be dropped (once written back) ahead of the
+    pipeline's input data. Does nothing on platforms without posix_fadvise.
+    
+    Args:
+        file_path: Path of the file
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        fd = os.open(file_path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def _categorize_strings(df, max_unique_ratio: float = 0.5):
+    """
+    Convert low-cardinality object columns to the category dtype.
+    
+    Args:
+        df (pandas.DataFrame): The DataFrame to convert; it is not modified
+        max_unique_ratio (float): Convert columns whose unique/row ratio is below this
+        
+    Returns:
+        pandas.DataFrame: A DataFrame with the converted columns
+    """
+    row_count = len(df)
+    if row_count == 0:
+        return df
+    
+    unique_counts = df.select_dtypes(include='object').nunique()
+    columns = [column for column, count in unique_counts.items() if count and count / row_count < max_unique_ratio]
+    if not columns:
+        return df
+    
+    df = df.copy(deep=False)
+    for column in columns:
+        df[column] = df[column].astype('category')
+    return df
+
+def _optimize_dtypes(df):
+    """
+    Shrink a DataFrame's memory use without changing its values.
+    
+    Low-cardinality string columns become categories, integer columns are
+    downcast to the smallest integer type holding their values, and float
+    columns become float32 when that loses no precision.
+    
+    Args:
+        df (pandas.DataFrame): The DataFrame to convert; it is not modified
+        
+    Returns:
+        pandas.DataFrame: A DataFrame with the converted columns
+    """
+    df = _categorize_strings(df).copy(deep=False)
+    for column in df.select_dtypes(include='integer').columns:
+        df[column] = pd.to_numeric(df[column], downcast='integer')
+    for column in df.select_dtypes(include='float').columns:
+        downcast = pd.to_numeric(df[column], downcast='float')
+        if np.array_equal(downcast.to_numpy(dtype='float64'), df[column].to_numpy(dtype='float64'), equal_nan=True):
+            df[column] = downcast
+    return df
 
 class StateManager:
     """
@@ -9,50 +372,231 @@ class StateManager:
     Manages run-specific directories and files for each execution of the AutoDS system.
     """
     
-    def __init__(self):
+    def __init__(self, categorize_strings: bool = False):
         """
-        Initialize the StateManager with a unique run ID and create necessary directories.
+        Initialize the StateManager with a unique run ID.
+        
+        The run's data, plots and reports directories are created the first time
+        something is saved to them.
+        
+        Args:
+            categorize_strings (bool): Convert low-cardinality string columns to the category
+                                       dtype whenever the DataFrame is updated. This saves memory
+                                       and speeds up profiling, but category columns reject values
+                                       outside their categories (e.g. fillna('Unknown')), which
+                                       generated code may not expect.
         """
-        # Generate a unique run_id based on current date and time
-        self.run_id = f"run_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        self.categorize_strings = categorize_strings
         
-        # Define the base output directory path
-        base_output_dir = Path(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))) / 'outputs'
+        # Generate a unique run_id based on current date and time, down to the
+        # microsecond so instances created within the same second don't share a directory
+        now_ns = time.time_ns()
+        timestamp = time.strftime('%Y%m%d_%H%M%S', time.localtime(now_ns // 1_000_000_000))
+        self.run_id = f"run_{timestamp}_{now_ns // 1000 % 1_000_000:06d}"
         
-        # Create the run-specific directory
-        self.run_dir = base_output_dir / self.run_id
-        self.run_dir.mkdir(exist_ok=True)
+        # Define the run-specific directory
+        self.run_dir = _BASE_OUTPUT_DIR / self.run_id
         
-        # Create subdirectories for data, plots, and reports
-        self.data_dir = self.run_dir / 'data'
-        self.plots_dir = self.run_dir / 'plots'
-        self.reports_dir = self.run_dir / 'reports'
+        # Subdirectories for data, plots, and reports, created when first used
+        self._data_dir = self.run_dir / 'data'
+        self._plots_dir = self.run_dir / 'plots'
+        self._reports_dir = self.run_dir / 'reports'
+        self._created_dirs = set()
         
-        self.data_dir.mkdir(exist_ok=True)
-        self.plots_dir.mkdir(exist_ok=True)
-        self.reports_dir.mkdir(exist_ok=True)
+        # String forms of the subdirectories for building file paths in the save methods
+        self._data_dir_str = str(self._data_dir)
+        self._plots_dir_str = str(self._plots_dir)
+        self._reports_dir_str = str(self._reports_dir)
         
         # Initialize DataFrame to None
         self.df = None
         
-        print(f"StateManager initialized with run ID: {self.run_id}")
-        print(f"Output directory: {self.run_dir}")
+        # Arrow table of the current DataFrame, built on the first get_arrow_table() call
+        self._arrow_cache = None
+        
+        # Optimized dtypes of loaded files, keyed by their sidecar path
+        self._dtypes = {}
+        
+        # DataFrames loaded by load_csv, keyed by (sidecar path, optimize). Entries
+        # only live as long as something else still holds the DataFrame.
+        self._load_cache = weakref.WeakValueDictionary()
+        
+        # Plots and reports are written in the background; flush() waits for them
+        self._io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="state-io")
+        self._pending_saves = []
+        
+        logger.info("StateManager initialized with run ID: %s", self.run_id)
+        logger.info("Output directory: %s", self.run_dir)
+    
+    def _ensure_dir(self, directory):
+        """
+        Create a run subdirectory (and the run directory) the first time it is needed.
+        
+        Args:
+            directory: The subdirectory to create, as a Path or string
+            
+        Returns:
+            The directory, unchanged
+        """
+        key = os.fspath(directory)
+        if key not in self._created_dirs:
+            os.makedirs(key, exist_ok=True)
+            self._created_dirs.add(key)
+        return directory
     
-    def load_csv(self, file_path: str):
+    @property
+    def data_dir(self):
+        """Path: The run's data directory, created on first access."""
+        return self._ensure_dir(self._data_dir)
+    
+    @property
+    def plots_dir(self):
+        """Path: The run's plots directory, created on first access."""
+        return self._ensure_dir(self._plots_dir)
+    
+    @property
+    def reports_dir(self):
+        """Path: The run's reports directory, created on first access."""
+        return self._ensure_dir(self._reports_dir)
+    
+    def load_csv(self, file_path: str, dtype=None, usecols=None, parse_dates=None, row_limit=None,
+                 optimize: bool = False):
         """
         Load a CSV file into a pandas DataFrame and store it in the instance.
         
+        The file is parsed with pandas' PyArrow engine, also when only row_limit rows
+        are read, so a file gets the same dtypes whatever its size and row_limit.
+        PyArrow's reader parses large files block by block, so they aren't split
+        into chunks. When PyArrow isn't installed or can't handle the file or
+        options, the C engine is used instead (memory-mapping local files), and
+        files above CHUNKED_READ_THRESHOLD bytes and row-limited reads go through
+        it in chunks.
+        
+        A local file is also saved as a hidden Parquet sidecar next to it, which
+        later loads of the unchanged file with the same options read instead.
+        Loading such a file again while its DataFrame is still in use returns
+        that same DataFrame without reading anything.
+        
         Args:
             file_path (str): Path to the CSV file to load
+            dtype: Optional column dtypes, as accepted by pandas.read_csv
+            usecols: Optional list of the columns to load
+            parse_dates: Optional list of the columns to parse as dates
+            row_limit (int): Optional maximum number of rows to load
+            optimize (bool): Shrink the DataFrame by converting low-cardinality string
+                             columns to categories and downcasting numeric columns.
+                             Category columns reject values outside their categories,
+                             which generated code may not expect.
         """
+        read_options = {'dtype': dtype, 'usecols': usecols, 'parse_dates': parse_dates}
         try:
-            self.df = pd.read_csv(file_path)
-            print(f"Loaded CSV from {file_path} with {len(self.df)} rows and {len(self.df.columns)} columns")
+            sidecar = _sidecar_path(file_path, row_limit=row_limit, **read_options)
+            
+            # Reuse the DataFrame of an earlier load of the unchanged file, if it is still alive
+            load_key = (sidecar, optimize) if sidecar is not None else None
+            df = self._load_cache.get(load_key) if load_key is not None else None
+            if df is not None:
+                self.df = df
+                self._arrow_cache = None
+                logger.info("Reusing CSV already loaded from %s with %d rows and %d columns", file_path, len(df), len(df.columns))
+                return True
+            
+            df = self._read_csv(file_path, sidecar, row_limit, read_options)
+            
+            if optimize:
+                # Reuse the dtypes found for an earlier load of the same file
+                dtypes = self._dtypes.get(sidecar) if sidecar is not None else None
+                df = df.astype(dtypes) if dtypes is not None else _optimize_dtypes(df)
+                if sidecar is not None:
+                    self._dtypes[sidecar] = df.dtypes.to_dict()
+            
+            if load_key is not None:
+                self._load_cache[load_key] = df
+            self.df = df
+            self._arrow_cache = None
+            logger.info("Loaded CSV from %s with %d rows and %d columns", file_path, len(self.df), len(self.df.columns))
             return True
         except Exception as e:
-            print(f"Error loading CSV: {e}")
+            logger.error("Error loading CSV: %s", e)
             return False
     
+    def load_csvs(self, paths: dict):
+        """
+        Load several CSV files in parallel.
+        
+        The files are parsed concurrently by PyArrow's CSV reader, which releases
+        the GIL, or by pandas' C engine when PyArrow isn't installed. Unlike
+        load_csv, the loaded DataFrames are returned rather than stored.
+        
+        Args:
+            paths (dict): Maps a name for each DataFrame to the path of its CSV file
+            
+        Returns:
+            dict: Maps each name to its DataFrame; files that failed to load are left out
+        """
+        def read(file_path):
+            if pa is not None:
+                return pacsv.read_csv(file_path)
+            return pd.read_csv(file_path, engine="c", low_memory=False, cache_dates=True)
+        
+        frames = {}
+        if not paths:
+            return frames
+        
+        with ThreadPoolExecutor(max_workers=min(len(paths), os.cpu_count() or 1)) as executor:
+            futures = {name: executor.submit(read, file_path) for name, file_path in paths.items()}
+            for name, future in futures.items():
+                try:
+                    frame = future.result()
+                    if pa is not None:
+                        # Free each Arrow column as soon as it has been converted
+                        frame = frame.to_pandas(self_destruct=True)
+                    frames[name] = frame
+                    logger.info("Loaded CSV from %s with %d rows and %d columns", paths[name], len(frame), len(frame.columns))
+                except Exception as e:
+                    logger.error("Error loading CSV %s: %s", paths[name], e)
+        return frames
+    
+    def _read_csv(self, file_path: str, sidecar, row_limit, read_options: dict):
+        """
+        Read a CSV file, or its Parquet sidecar if one exists for these options.
+        
+        Args:
+            file_path (str): Path to the CSV file to read
+            sidecar (Path): The sidecar path from _sidecar_path, or None
+            row_limit (int): Optional maximum number of rows to read
+            read_options (dict): dtype, usecols and parse_dates options for pandas.read_csv
+            
+        Returns:
+            pandas.DataFrame: The loaded DataFrame
+        """
+        if sidecar is not None and sidecar.is_file():
+            try:
+                return _read_sidecar(sidecar)
+            except Exception as e:
+                logger.warning("Could not read cached Parquet copy, parsing the CSV: %s", e)
+        
+        try:
+            df = _read_csv_with_arrow(file_path, row_limit, **read_options)
+        except (ImportError, ValueError):
+            oversize = os.path.isfile(file_path) and os.stat(file_path).st_size > CHUNKED_READ_THRESHOLD
+            if oversize or row_limit is not None:
+                df = _read_csv_in_chunks(file_path, row_limit, **read_options)
+            else:
+                df = pd.read_csv(
+                    file_path,
+                    engine="c",
+                    low_memory=False,
+                    cache_dates=True,
+                    # Parse local files straight from the page cache
+                    memory_map=os.path.isfile(file_path),
+                    **read_options
+                )
+        
+        if sidecar is not None:
+            _write_sidecar(df, sidecar)
+        return df
+    
     def get_dataframe(self):
         """
         Return the current DataFrame stored in the instance.
@@ -62,67 +606,179 @@ class StateManager:
         """
         return self.df
     
-    def update_dataframe(self, new_df):
+    def get_arrow_table(self):
+        """
+        Return the current DataFrame as a PyArrow table, without its index.
+        
+        The table is built once per DataFrame and reused until the DataFrame is
+        replaced, so Arrow consumers (DuckDB, Polars, pyarrow.compute) can share it.
+        
+        Returns:
+            pyarrow.Table: The current DataFrame as a table, or None if there is no DataFrame
+        """
+        if pa is None:
+            raise ImportError("pyarrow is required for get_arrow_table")
+        if self.df is None:
+            return None
+        if self._arrow_cache is None:
+            self._arrow_cache = pa.Table.from_pandas(self.df, preserve_index=False)
+        return self._arrow_cache
+    
+    def update_dataframe(self, new_df, copy: bool = False):
         """
         Update the instance's DataFrame with a new one.
         
+        The stored DataFrame's column blocks are consolidated, so frames built up
+        column by column don't stay fragmented for the following tasks.
+        
         Args:
             new_df (pandas.DataFrame): The new DataFrame to store
+            copy (bool): Store a copy of new_df, e.g. when it is a slice of a larger
+                         DataFrame that should not be kept alive
         """
+        if copy:
+            new_df = new_df.copy()
+        if self.categorize_strings:
+            new_df = _categorize_strings(new_df)
+        if hasattr(new_df, '_consolidate_inplace'):
+            new_df._consolidate_inplace()
         self.df = new_df
-        print(f"DataFrame updated with {len(self.df)} rows and {len(self.df.columns)} columns")
+        self._arrow_cache = None
+        logger.info("DataFrame updated with %d rows and %d columns", len(self.df), len(self.df.columns))
     
     def save_dataframe(self, filename: str):
         """
-        Save the current DataFrame to a CSV file in the run-specific data directory.
+        Save the current DataFrame to a file in the run-specific data directory.
+        
+        Files ending in .parquet or .pq are written as zstd-compressed Parquet,
+        anything else as CSV.
         
         Args:
             filename (str): Name of the file to save (e.g., "final_data.csv")
         """
         if self.df is None:
-            print("No DataFrame to save")
+            logger.warning("No DataFrame to save")
             return False
         
-        file_path = self.data_dir / filename
         try:
-            self.df.to_csv(file_path, index=False)
-            print(f"DataFrame saved to {file_path}")
+            file_path = os.path.join(self._ensure_dir(self._data_dir_str), filename)
+            if os.path.splitext(filename)[1].lower() in ('.parquet', '.pq'):
+                self.df.to_parquet(file_path, engine="pyarrow", compression="zstd", index=False)
+            else:
+                _write_csv(self.df, file_path)
+            _drop_page_cache(file_path)
+            logger.info("DataFrame saved to %s", file_path)
             return True
         except Exception as e:
-            print(f"Error saving DataFrame: {e}")
+            logger.error("Error saving DataFrame: %s", e)
             return False
     
-    def save_plot(self, figure, filename: str):
+    def save_plot(self, figure, filename: str, tight: bool = False, dpi='figure'):
         """
         Save a matplotlib figure to the run-specific plots directory.
         
+        The figure is encoded and written in the background, so the caller must
+        not modify or close it until the returned future is done (or flush() returns).
+        
         Args:
             figure: A matplotlib figure object
             filename (str): Name of the file to save (e.g., "distribution.png")
+            tight (bool): Crop the saved image to the figure's content. This renders
+                          the figure twice; calling figure.tight_layout() when building
+                          the figure avoids clipped labels without that cost.
+            dpi (int or str): Resolution of the saved image; 'figure' keeps the
+                              figure's own dpi, as matplotlib does by default
+            
+        Returns:
+            Future: Resolves to True if the plot was saved, False otherwise
+        """
+        savefig_options = {'dpi': dpi, 'bbox_inches': 'tight' if tight else None}
+        return self._submit_save(
+            self._write_plot,
+            (figure, savefig_options),
+            os.path.join(self._plots_dir_str, filename)
+        )
+    
+    def save_report(self, content: str, filename: str):
+        """
+        Save a report to the run-specific reports directory.
+        
+        The report is written in the background.
+        
+        Args:
+            content (str): Content of the report
+            filename (str): Name of the file to save (e.g., "final_report.md")
+            
+        Returns:
+            Future: Resolves to True if the report was saved, False otherwise
+        """
+        return self._submit_save(self._write_report, content, os.path.join(self._reports_dir_str, filename))
+    
+    def flush(self):
+        """
+        Wait until all plots and reports submitted so far have been written.
+        """
+        pending_saves, self._pending_saves = self._pending_saves, []
+        wait(pending_saves)
+    
+    def _submit_save(self, write, content, file_path: str):
+        """
+        Run a write function on the I/O pool and track it for flush().
+        
+        Args:
+            write: The function that writes the content to file_path
+            content: The figure or text to write
+            file_path (str): Destination of the file
+            
+        Returns:
+            Future: The future of the write
+        """
+        # Drop saves that have already finished
+        self._pending_saves = [future for future in self._pending_saves if not future.done()]
+        future = self._io_pool.submit(write, content, file_path)
+        self._pending_saves.append(future)
+        return future
+    
+    def _write_plot(self, plot, file_path: str):
+        """
+        Write a matplotlib figure to a file.
+        
+        Args:
+            plot (tuple): The matplotlib figure and its savefig keyword arguments
+            file_path (str): Destination of the plot
+            
+        Returns:
+            bool: True if the plot was saved, False otherwise
         """
-        file_path = self.plots_dir / filename
         try:
-            figure.savefig(file_path, bbox_inches='tight')
-            print(f"Plot saved to {file_path}")
+            self._ensure_dir(os.path.dirname(file_path))
+            figure, savefig_options = plot
+            figure.savefig(file_path, **savefig_options)
+            _drop_page_cache(file_path)
+            logger.info("Plot saved to %s", file_path)
             return True
         except Exception as e:
-            print(f"Error saving plot: {e}")
+            logger.error("Error saving plot: %s", e)
             return False
     
-    def save_report(self, content: str, filename: str):
+    def _write_report(self, content: str, file_path: str):
         """
-        Save a report to the run-specific reports directory.
+        Write a report to a file.
         
         Args:
             content (str): Content of the report
-            filename (str): Name of the file to save (e.g., "final_report.md")
+            file_path (str): Destination of the report
+            
+        Returns:
+            bool: True if the report was saved, False otherwise
         """
-        file_path = self.reports_dir / filename
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
+            self._ensure_dir(os.path.dirname(file_path))
+            with open(file_path, 'w', encoding='utf-8', buffering=REPORT_BUFFER_SIZE) as f:
                 f.write(content)
-            print(f"Report saved to {file_path}")
+            _drop_page_cache(file_path)
+            logger.info("Report saved to %s", file_path)
             return True
         except Exception as e:
-            print(f"Error saving report: {e}")
-            return False
\ No newline at end of file
+            logger.error("Error saving report: %s", e)
+            return False
@@ -0,0 +1,206 @@
+import pandas as pd
+import pytest
+
+from src.core.code_executor import CodeExecutor, _Worker
+from src.core.executor_worker import fingerprint_dataframe
+
+SAFE_CODE = [
+    # Column cleanup with pandas and numpy functions
+    """
+def transform_data(df):
+    df = df.drop(columns=['id'], errors='ignore')
+    df['income'] = df['income'].fillna(df['income'].median())
+    df['log_income'] = np.log1p(df['income'])
+    df['term'] = pd.to_numeric(df['term'].str.extract(r'(\\d+)')[0], errors='coerce')
+    return df
+""",
+    # Assignments to the DataFrame's own items and columns
+    """
+def transform_data(df):
+    df.loc[df['a'] < 0, 'a'] = 0
+    df.columns = [column.lower() for column in df.columns]
+    df.index.name = 'row'
+    return df
+""",
+    # pandas classes called or used in isinstance checks, numpy dtypes as arguments
+    """
+import pandas as pd
+def transform_data(df):
+    if not isinstance(df, (pd.DataFrame, pd.Series)):
+        return pd.DataFrame(df)
+    df['b'] = df['b'].astype(np.float64)
+    numeric = df.select_dtypes(include=np.number)
+    return pd.concat([df, numeric.add_suffix('_copy')], axis=1)
+""",
+    # Functions given to string-dispatch methods as literals, lambdas or own functions
+    """
+def clip_outliers(s):
+    return s.clip(upper=s.quantile(0.99))
+def transform_data(df):
+    df['a'] = df.groupby('g')['a'].transform('mean')
+    df[['a', 'b']] = df[['a', 'b']].apply(clip_outliers)
+    df['c'] = df['c'].map({'yes': 1, 'no': 0})
+    df['d'] = df['b'].apply(lambda value: value * 2)
+    summary = df.groupby('g').agg(total=('a', 'sum'), max_b=pd.NamedAgg('b', 'max'))
+    return df.merge(summary, left_on='g', right_index=True)
+""",
+]
+
+UNSAFE_CODE = [
+    # Reaching another module through an imported module's attributes
+    """
+import re
+def transform_data(df):
+    df['n'] = len(re.enum.sys.modules['os'].environ)
+    return df
+""",
+    # Patching pandas classes for every later task
+    """
+def transform_data(df):
+    pd.DataFrame.head = lambda self, n=5: 'broken'
+    return df
+""",
+    """
+def transform_data(df):
+    cls = pd.DataFrame
+    cls.head = None
+    return df
+""",
+    """
+def helper(cls):
+    cls.columns = []
+def transform_data(df):
+    helper(pd.Series)
+    return df
+""",
+    # Module attributes outside the allow-list, or chained further
+    "def transform_data(df):\n    np.random.seed(0)\n    return df",
+    "def transform_data(df):\n    return pd.read_csv('other.csv')",
+    "def transform_data(df):\n    pd.options.mode.copy_on_write = True\n    return df",
+    "def transform_data(df):\n    return pd.DataFrame.head(df)",
+    # Imports outside SAFE_IMPORTS, from-imports, and rebinding module names
+    "import os\ndef transform_data(df):\n    return df",
+    "from pandas import DataFrame\ndef transform_data(df):\n    return df",
+    "def transform_data(df, pd=None):\n    return df",
+    # Bare module references
+    "def transform_data(df):\n    df.attrs['m'] = pd\n    return df",
+    # Stores through module roots, or to attributes that aren't data
+    "def transform_data(df):\n    np.nan = 0\n    return df",
+    "def transform_data(df):\n    df.sum = None\n    return df",
+    # Private attributes, I/O methods and unknown names
+    "def transform_data(df):\n    return df.__class__(df)",
+    "def transform_data(df):\n    df.to_csv('out.csv')\n    return df",
+    "def transform_data(df):\n    df.agg('to_csv')\n    return df",
+    "def transform_data(df):\n    return df.agg('__class__')",
+    # Method names built at runtime and passed to string-dispatch methods
+    "def transform_data(df):\n    df.agg('t' + 'o_csv', path_or_buf='out.csv')\n    return df",
+    "def transform_data(df):\n    df.apply(''.join(['t', 'o_csv']), path_or_buf='out.csv')\n    return df",
+    "def transform_data(df):\n    return df.agg('_' + '_class__')",
+    "def transform_data(df):\n    name = 'to' + '_csv'\n    df.groupby('a').agg(name)\n    return df",
+    "def transform_data(df):\n    df.groupby('a').agg(total=('b', 't' + 'o_csv'))\n    return df",
+    "def transform_data(df):\n    df.rolling(2).aggregate(f'to_{\"csv\"}')\n    return df",
+    "def transform_data(df):\n    df.agg('apply', 't' + 'o_csv')\n    return df",
+    "def transform_data(df):\n    return pd.pivot_table(df, index='a', aggfunc='t' + 'o_csv')",
+    "def transform_data(df):\n    dispatch = df.transform\n    return dispatch('t' + 'o_csv')",
+    "def f(x):\n    return x\ndef transform_data(df):\n    f = 't' + 'o_csv'\n    return df.pipe(f)",
+    "def transform_data(df):\n    return df.agg('_to_dict_of_blocks')",
+    "def transform_data(df):\n    open('x', 'w')\n    return df",
+]
+
+@pytest.mark.parametrize("code", SAFE_CODE)
+def test_is_safe_accepts_plain_transforms(code):
+    assert CodeExecutor._is_safe(code)
+
+@pytest.mark.parametrize("code", UNSAFE_CODE)
+def test_is_safe_rejects_escapes(code):
+    assert not CodeExecutor._is_safe(code)
+
+def test_execute_in_process_leaves_input_unmodified():
+    input_df = pd.DataFrame({'a': [-1, 2], 'b': ['1.5', '2'], 'id': [1, 2],
+                             'income': [1.0, None], 'term': [' 36 months', ' 60 months']})
+    output_df = CodeExecutor._execute_in_process(SAFE_CODE[0], input_df)['dataframe']
+    
+    assert list(output_df.columns) == ['a', 'b', 'income', 'term', 'log_income']
+    assert output_df['term'].tolist() == [36, 60]
+    assert 'id' in input_df.columns
+
+def test_execute_code_does_not_rerun_failed_in_process_code_in_a_worker(tmp_path, monkeypatch):
+    executor = CodeExecutor(temp_dir=str(tmp_path), prewarm_workers=0)
+    def fail_acquire(frame_key=None):
+        raise AssertionError("code was sent to a worker")
+    monkeypatch.setattr(executor, '_acquire_worker', fail_acquire)
+    code = "def transform_data(df):\n    return df['missing']"
+    assert CodeExecutor._is_safe(code)
+    
+    result = executor.execute_code(code, pd.DataFrame({'a': [1, 2]}))
+    
+    assert result['status'] == 'error'
+    assert "KeyError: 'missing'" in result['traceback']
+
+# print isn't available in-process, so this code always runs in a worker
+WORKER_CODE = "def transform_data(df):\n    print(len(df))\n    df['d'] = df['a'] * 2\n    return df"
+
+@pytest.fixture
+def worker_executor(tmp_path, monkeypatch):
+    executor = CodeExecutor(temp_dir=str(tmp_path), prewarm_workers=0)
+    # Record whether each worker request carried the DataFrame or only the code
+    sent_frames = []
+    request = _Worker.request
+    def recording_request(worker, message):
+        sent_frames.append(message['dataframe'] is not None)
+        return request(worker, message)
+    monkeypatch.setattr(_Worker, 'request', recording_request)
+    executor.sent_frames = sent_frames
+    yield executor
+    executor.cleanup()
+
+def test_worker_reuses_the_frame_it_holds(worker_executor):
+    first = worker_executor.execute_code(WORKER_CODE, pd.DataFrame({'a': [1, 2, 3]}))
+    second = worker_executor.execute_code(WORKER_CODE, first['dataframe'])
+    
+    assert second['status'] == 'success'
+    assert second['dataframe']['d'].tolist() == [2, 4, 6]
+    assert worker_executor.sent_frames == [True, False]
+
+def test_worker_is_sent_the_frame_when_it_no_longer_holds_it(worker_executor):
+    worker_executor.execute_code(WORKER_CODE, pd.DataFrame({'a': [1, 2, 3]}))
+    other_df = pd.DataFrame({'a': [5, 6]})
+    # Make the pool believe the worker holds other_df
+    worker_executor._idle_workers[0].frame_key = fingerprint_dataframe(other_df)
+    
+    result = worker_executor.execute_code(WORKER_CODE, other_df)
+    
+    assert result['dataframe']['d'].tolist() == [10, 12]
+    assert worker_executor.sent_frames == [True, False, True]
+
+def test_worker_runs_on_a_frame_modified_between_calls(worker_executor):
+    output_df = worker_executor.execute_code(WORKER_CODE, pd.DataFrame({'a': [1, 2, 3]}))['dataframe']
+    output_df['a'] = 100
+    
+    result = worker_executor.execute_code(WORKER_CODE, output_df)
+    
+    assert result['dataframe']['d'].tolist() == [200, 200, 200]
+    assert worker_executor.sent_frames == [True, True]
+
+def test_result_cache_persists_entries_across_executors(tmp_path):
+    df = pd.DataFrame({'a': [1, 2, 3]})
+    key = CodeExecutor._cache_key(SAFE_CODE[0], fingerprint_dataframe(df))
+    CodeExecutor(temp_dir=str(tmp_path), prewarm_workers=0)._cache_put(key, df.assign(b=1))
+    
+    cached_df = CodeExecutor(temp_dir=str(tmp_path), prewarm_workers=0)._cache_get(key)
+    
+    pd.testing.assert_frame_equal(cached_df, df.assign(b=1))
+
+def test_result_cache_is_keyed_by_the_current_contents_of_the_input(worker_executor):
+    output_df = worker_executor.execute_code(WORKER_CODE, pd.DataFrame({'a': [1, 2, 3]}))['dataframe']
+    output_df['a'] = 100
+    code = "def transform_data(df):\n    df['e'] = df['a'] + df['d']\n    return df"
+    
+    modified = worker_executor.execute_code(code, output_df)
+    # Equal to output_df before it was modified
+    fresh = worker_executor.execute_code(code, pd.DataFrame({'a': [1, 2, 3], 'd': [2, 4, 6]}))
+    
+    assert modified['dataframe']['e'].tolist() == [102, 104, 106]
+    assert 'cached' not in fresh
+    assert fresh['dataframe']['e'].tolist() == [3, 6, 9]
+    assert worker_executor.execute_code(code, output_df)['cached']
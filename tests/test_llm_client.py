@@ -0,0 +1,34 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.agents import llm_client
+
+def make_chunk(content, finish_reason=None):
+    delta = SimpleNamespace(content=content)
+    return SimpleNamespace(choices=[SimpleNamespace(delta=delta, finish_reason=finish_reason)])
+
+@pytest.fixture
+def stream_response(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_client, 'CACHE_DIR', tmp_path)
+    monkeypatch.setenv("AUTODS_LLM_CACHE", "1")
+    
+    def set_chunks(chunks):
+        create = lambda **request: iter(chunks)
+        client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        monkeypatch.setattr(llm_client, 'get_client', lambda: client)
+    
+    return set_chunks
+
+def test_complete_chat_caches_finished_responses(tmp_path, stream_response):
+    stream_response([make_chunk("Hello"), make_chunk(" world"), make_chunk(None, "stop")])
+    
+    assert llm_client.complete_chat(model="m", messages=[]) == "Hello world"
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+@pytest.mark.parametrize("finish_reason", ["length", "content_filter", None])
+def test_complete_chat_does_not_cache_incomplete_responses(tmp_path, stream_response, finish_reason):
+    stream_response([make_chunk("Hello"), make_chunk(None, finish_reason)])
+    
+    assert llm_client.complete_chat(model="m", messages=[]) == "Hello"
+    assert not list(tmp_path.glob("*.json"))
@@ -0,0 +1,92 @@
+from types import SimpleNamespace
+
+import pandas as pd
+
+from src.core import orchestrator
+from src.core.orchestrator import Orchestrator
+
+def make_task(task_id, reads, writes, code="def transform_data(df):\n    return df"):
+    return {'id': task_id, 'task': f"Task {task_id}", 'code': code, 'reads': reads, 'writes': writes}
+
+def stage_ids(plan):
+    return [[task_item['id'] for task_item in stage] for stage in Orchestrator._build_stages(plan)]
+
+def test_build_stages_groups_independent_tasks():
+    plan = [
+        make_task(1, ['a'], ['a']),
+        make_task(2, ['b'], ['b']),
+        make_task(3, ['a', 'b'], ['c']),
+        make_task(4, ['d'], ['d']),
+    ]
+    
+    assert stage_ids(plan) == [[1, 2, 4], [3]]
+
+def test_build_stages_orders_conflicting_tasks():
+    plan = [
+        make_task(1, ['a'], ['b']),
+        make_task(2, ['b'], ['c']),
+        make_task(3, [], ['a']),
+    ]
+    
+    # 2 reads what 1 writes; 3 writes what 1 reads
+    assert stage_ids(plan) == [[1], [2, 3]]
+
+def test_build_stages_treats_undeclared_and_empty_writes_as_barriers():
+    plan = [
+        make_task(1, ['a'], ['a']),
+        make_task(2, [], []),
+        make_task(3, ['b'], ['b']),
+        make_task(4, ['*'], ['c']),
+        make_task(5, ['d'], ['d'], code=None),
+        make_task(6, ['e'], ['e']),
+    ]
+    
+    assert stage_ids(plan) == [[1], [2], [3], [4], [5], [6]]
+
+def test_merge_task_result_applies_declared_changes():
+    df = pd.DataFrame({'a': [1, 2], 'b': [3, 4], 'c': [5, 6]})
+    input_slice = df[['a', 'b']]
+    result_df = input_slice.assign(a=[10, 20], d=[7, 8]).drop(columns=['b'])
+    
+    merged_df = Orchestrator._merge_task_result(df, make_task(1, ['a'], ['a', 'b', 'd']), input_slice, result_df)
+    
+    assert list(merged_df.columns) == ['a', 'c', 'd']
+    assert merged_df['a'].tolist() == [10, 20]
+    assert merged_df['c'].tolist() == [5, 6]
+
+def test_merge_task_result_rejects_undeclared_changes():
+    df = pd.DataFrame({'a': [1, 2], 'b': [3, 4]})
+    input_slice = df[['a', 'b']]
+    task_item = make_task(1, ['a', 'b'], ['a'])
+    
+    # Modifies an undeclared column
+    assert Orchestrator._merge_task_result(df, task_item, input_slice, input_slice.assign(b=[0, 0])) is None
+    # Drops an undeclared column
+    assert Orchestrator._merge_task_result(df, task_item, input_slice, input_slice.drop(columns=['b'])) is None
+    # Removes rows
+    assert Orchestrator._merge_task_result(df, task_item, input_slice, input_slice.iloc[:1]) is None
+
+def test_merge_task_result_rejects_undeclared_column_clashing_with_another():
+    df = pd.DataFrame({'a': [1, 2], 'b': [3, 4]})
+    input_slice = df[['a']]
+    result_df = input_slice.assign(b=[0, 0])
+    
+    assert Orchestrator._merge_task_result(df, make_task(1, ['a'], ['a']), input_slice, result_df) is None
+
+def test_execute_with_retries_records_attempts_made_when_debugger_converges(monkeypatch):
+    orchestrator_instance = Orchestrator.__new__(Orchestrator)
+    orchestrator_instance._verbose = False
+    orchestrator_instance.console = SimpleNamespace(print=lambda *args, **kwargs: None, log=lambda *args, **kwargs: None)
+    orchestrator_instance.code_executor = SimpleNamespace(
+        execute_code=lambda code, df, frame_key=None: {'status': 'error', 'traceback': "ValueError: bad"}
+    )
+    # The debugger returns the code unchanged, so the second execution is skipped
+    monkeypatch.setattr(orchestrator.debugger_agent, 'fix_code', lambda code, error: code)
+    task_item = make_task(1, ['a'], ['a'])
+    
+    log_entry, result_df = orchestrator_instance._execute_with_retries(
+        task_item, task_item['code'], pd.DataFrame({'a': [1]}), max_attempts=3
+    )
+    
+    assert result_df is None
+    assert log_entry['attempts'] == 1
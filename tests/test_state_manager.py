@@ -0,0 +1,137 @@
+import gzip
+import io
+
+import pandas as pd
+import pytest
+
+from src.core import state_manager
+from src.core.state_manager import StateManager, _write_csv
+
+@pytest.mark.parametrize("filename", ["data.csv", "data.csv.gz", "data.csv.bz2", "data.csv.xz", "data.csv.zip"])
+def test_write_csv_round_trips_with_compression_from_extension(tmp_path, filename):
+    df = pd.DataFrame({'a': range(5), 'b': list('abcde')})
+    file_path = tmp_path / filename
+    
+    _write_csv(df, file_path)
+    
+    pd.testing.assert_frame_equal(pd.read_csv(file_path), df)
+
+def test_write_csv_saves_duplicate_column_names(tmp_path):
+    df = pd.DataFrame([[1, 2], [3, 4]], columns=['a', 'a'])
+    file_path = tmp_path / "data.csv"
+    
+    _write_csv(df, file_path)
+    
+    assert file_path.read_text().splitlines() == ['a,a', '1,2', '3,4']
+
+def test_write_csv_converts_chunks_with_different_types(tmp_path, monkeypatch):
+    monkeypatch.setattr(state_manager, 'CSV_WRITE_CHUNK_SIZE', 2)
+    df = pd.DataFrame({'a': [float('nan'), float('nan'), 'x', 'y'], 'b': [1, 2, 3, 4]})
+    file_path = tmp_path / "data.csv"
+    
+    _write_csv(df, file_path)
+    
+    pd.testing.assert_frame_equal(pd.read_csv(file_path), df)
+    
+    _write_csv(df.iloc[:0], file_path)
+    
+    assert file_path.read_text().splitlines() == ['"a","b"']
+
+def test_write_csv_writes_floats_and_datetimes_like_pandas(tmp_path):
+    df = pd.DataFrame({
+        'f': [1.0, 2.0],
+        't': pd.to_datetime(['2020-01-01 10:00:00', '2020-01-02 00:00:00']),
+        'n': [1, 2],
+        's': ['x', 'y'],
+    })
+    file_path = tmp_path / "data.csv"
+    
+    _write_csv(df, file_path)
+    
+    assert file_path.read_text() == df.to_csv(index=False)
+    pd.testing.assert_frame_equal(pd.read_csv(file_path, parse_dates=['t']), df)
+
+def test_write_csv_round_trips_arrow_written_columns(tmp_path):
+    df = pd.DataFrame({'n': [1, -2], 'b': [True, False], 's': ['x, "quoted"', None]})
+    assert state_manager._arrow_csv_round_trips(df)
+    file_path = tmp_path / "data.csv"
+    
+    _write_csv(df, file_path)
+    
+    pd.testing.assert_frame_equal(pd.read_csv(file_path), pd.read_csv(io.StringIO(df.to_csv(index=False))))
+
+def test_write_csv_compresses_zstd_at_the_configured_level(tmp_path, monkeypatch):
+    pa = pytest.importorskip("pyarrow")
+    df = pd.DataFrame({'a': range(1000), 'b': ['text'] * 1000})
+    file_path = tmp_path / "data.csv.zst"
+    
+    _write_csv(df, file_path)
+    
+    # A single chunk is one zstd frame, identical to compressing the CSV text at level 3
+    monkeypatch.setattr(state_manager, 'CSV_COMPRESSION', {})
+    _write_csv(df, tmp_path / "data.csv")
+    expected = pa.Codec('zstd', compression_level=3).compress((tmp_path / "data.csv").read_bytes(), asbytes=True)
+    assert file_path.read_bytes() == expected
+
+CSV_TEXT = (
+    "n,s,t,f\n"
+    "1,,2020-01-01 10:00:00,1.5\n"
+    "2,x,2020-01-02 10:00:00,\n"
+    "\n"
+    "3,y,2020-01-03 10:00:00,2.5\n"
+    "4,z,2020-01-04 10:00:00,3.5\n"
+)
+
+def load(file_path, **load_options):
+    state = StateManager()
+    assert state.load_csv(str(file_path), **load_options)
+    return state.get_dataframe()
+
+@pytest.mark.parametrize("filename", ["data.csv", "data.csv.gz", "data.csv.zip"])
+def test_load_csv_with_row_limit_matches_the_full_load(tmp_path, filename):
+    file_path = tmp_path / filename
+    if filename.endswith(".zip"):
+        pd.read_csv(io.StringIO(CSV_TEXT)).to_csv(file_path, index=False)
+    else:
+        file_path.write_bytes(gzip.compress(CSV_TEXT.encode()) if filename.endswith(".gz") else CSV_TEXT.encode())
+    
+    full_df = load(file_path)
+    # The blank line holds no row, so reaching 3 rows takes more lines
+    limited_df = load(file_path, row_limit=3)
+    
+    assert str(full_df['t'].dtype).startswith('datetime64')
+    pd.testing.assert_series_equal(limited_df.dtypes, full_df.dtypes)
+    pd.testing.assert_frame_equal(limited_df, full_df.iloc[:3])
+    assert limited_df['s'].iloc[0] is full_df['s'].iloc[0]
+
+def test_load_csv_reloads_the_same_frame_from_the_sidecar(tmp_path):
+    file_path = tmp_path / "data.csv"
+    file_path.write_text(
+        "n,s,t,z\n"
+        "1,,2020-01-01 10:00:00,2020-01-01T10:00:00Z\n"
+        "2,x,2020-01-02 10:00:00,2020-01-02T10:00:00Z\n"
+    )
+    
+    first_df = load(file_path)
+    assert len(list(tmp_path.glob(".data.csv.*.parquet"))) == 1
+    reloaded_df = load(file_path)
+    
+    assert str(first_df['t'].dtype) == 'datetime64[s]'
+    assert str(first_df['z'].dtype) == 'datetime64[s, UTC]'
+    pd.testing.assert_frame_equal(reloaded_df, first_df)
+    assert reloaded_df['s'].iloc[0] is None
+
+def test_load_csv_keeps_a_sidecar_per_read_options(tmp_path):
+    file_path = tmp_path / "data.csv"
+    file_path.write_text(CSV_TEXT)
+    
+    load(file_path)
+    load(file_path, row_limit=2)
+    assert len(list(tmp_path.glob(".data.csv.*.parquet"))) == 2
+    
+    assert len(load(file_path)) == 4
+    
+    # Sidecars of the earlier version of the file are deleted on the next write
+    file_path.write_text(CSV_TEXT + "5,w,2020-01-05 10:00:00,4.5\n")
+    assert len(load(file_path)) == 5
+    assert len(list(tmp_path.glob(".data.csv.*.parquet"))) == 1